@@ -20,827 +20,902 @@
 def shortCuts():
     """
     ShortCuts overlay for FreeCAD.
+    Return the function that builds the overlay and returns its handles.
     """
-    import platform
+    import time
     from PySide import QtGui
     from PySide import QtCore
     import FreeCADGui as Gui
     import FreeCAD as App
     from ShortCutsLocator import delayTimer
+    from ShortCutsLocator import onEventLoop
+    import ShortCuts_Instrument
 
-    macOS = False
-
-    if platform.system() == "Darwin":
-        macOS = True
-    else:
-        pass
+    timeImport = time.time()
 
     mw = Gui.getMainWindow()
-    mdi = mw.findChild(QtGui.QMdiArea)
-    paramGet = App.ParamGet("User parameter:BaseApp/ShortCuts/User")
-
-    iconSvgNone = """<svg
-        xmlns="http://www.w3.org/2000/svg" height="64" width="64">
-         <rect height="64" width="64" fill="none" />
-        </svg>"""
-
-    iconSvgLocal = """<svg
-        xmlns="http://www.w3.org/2000/svg" height="64" width="64">
-         <circle cx="32" cy="32" r="20"
-          stroke="black" stroke-width="2" fill="#008000" />
-        </svg>"""
-
-    iconSvgGlobal = """<svg
-        xmlns="http://www.w3.org/2000/svg" height="64" width="64">
-         <circle cx="32" cy="32" r="20"
-          stroke="black" stroke-width="2" fill="#edd400" />
-        </svg>"""
-
-    iconSvgLG = """<svg
-        xmlns="http://www.w3.org/2000/svg" height="64" width="64">
-         <circle cx="44" cy="44" r="18"
-          stroke="black" stroke-width="2" fill="#edd400" />
-         <circle cx="20" cy="20" r="18"
-          stroke="black" stroke-width="2" fill="#008000" />
-        </svg>"""
-
-    iconSvgPref = """<svg
-        xmlns="http://www.w3.org/2000/svg" height="64" width="64">
-         <rect height="7" width="44" y="11" x="10" fill="#888a85" />
-         <rect height="7" width="44" y="28.5" x="10" fill="#888a85" />
-         <rect height="7" width="44" y="46" x="10" fill="#888a85" />
-        </svg>"""
-
-    iconPixNone = QtGui.QPixmap()
-    iconPixNone.loadFromData(str.encode(iconSvgNone))
-
-    iconPixLocal = QtGui.QPixmap()
-    iconPixLocal.loadFromData(str.encode(iconSvgLocal))
-
-    iconPixGlobal = QtGui.QPixmap()
-    iconPixGlobal.loadFromData(str.encode(iconSvgGlobal))
-
-    iconPixLG = QtGui.QPixmap()
-    iconPixLG.loadFromData(str.encode(iconSvgLG))
-
-    iconPixPref = QtGui.QPixmap()
-    iconPixPref.loadFromData(str.encode(iconSvgPref))
-
-    iconFreeCAD = QtGui.QIcon.fromTheme("freecad")
-
-    if iconFreeCAD.isNull():
-        iconFreeCAD = QtGui.QIcon(iconPixNone)
-    else:
-        pass
-
-    styleEdit = """
-        QLineEdit {
-            border: 1px outset silver;
-        }"""
-
-    styleButtonPref = """
-        QToolButton {
-            border: 1px solid #1e1e1e;
-            background-color: #3c3c3c;
-        }"""
+    paramGet = ShortCuts_Instrument.params("User parameter:"
+                                           "BaseApp/ShortCuts/User")
 
-    styleContainer = """
-        QMenu {
-            background: transparent
-        }"""
+    # Overlay handles, filled on first use
+    instance = {}
 
-    def xpmParse(i):
+    def build():
         """
-        Parse and prepare workbench icon in XPM format.
+        Build the overlay widgets and assets.
+        Called on first invocation or on an idle tick after start.
         """
-        icon = []
+        if instance:
+            return instance
+        else:
+            pass
 
-        for a in ((((i
-                     .split('{', 1)[1])
-                    .rsplit('}', 1)[0])
-                   .strip())
-                  .split("\n")):
-            icon.append((a
-                         .split('"', 1)[1])
-                        .rsplit('"', 1)[0])
+        timeBuild = time.time()
 
-        return icon
+        import heapq
+        import platform
+        import ShortCuts_Registry
+        import ShortCuts_Match
+        import ShortCuts_Icons
+        import ShortCuts_Model
+        import ShortCuts_Conflicts
 
-    def wbIcon(i):
-        """
-        Create and return workbench icon.
-        """
-        if str(i.find("XPM")) != "-1":
-            icon = QtGui.QIcon(QtGui.QPixmap(xpmParse(i)))
-        else:
-            icon = QtGui.QIcon(QtGui.QPixmap(i))
+        macOS = False
 
-        if icon.isNull():
-            icon = iconFreeCAD
+        if platform.system() == "Darwin":
+            macOS = True
         else:
             pass
 
-        return icon
+        mdi = mw.findChild(QtGui.QMdiArea)
 
-    def actionList():
-        """
-        Create a dictionary of unique actions.
-        """
-        actions = {}
-        duplicates = []
-
-        for i in mw.findChildren(QtGui.QAction):
-            if i.objectName() and i.text():
-                if i.objectName() in actions:
-                    if i.objectName() not in duplicates:
-                        duplicates.append(i.objectName())
-                    else:
-                        pass
-                else:
-                    actions[i.objectName()] = i
-            else:
-                pass
+        iconSvgNone = """<svg
+            xmlns="http://www.w3.org/2000/svg" height="64" width="64">
+             <rect height="64" width="64" fill="none" />
+            </svg>"""
 
-        for d in duplicates:
-            del actions[d]
+        iconSvgPref = """<svg
+            xmlns="http://www.w3.org/2000/svg" height="64" width="64">
+             <rect height="7" width="44" y="11" x="10" fill="#888a85" />
+             <rect height="7" width="44" y="28.5" x="10" fill="#888a85" />
+             <rect height="7" width="44" y="46" x="10" fill="#888a85" />
+            </svg>"""
 
-        return actions
+        iconNone = ShortCuts_Icons.svgIcon("None", iconSvgNone)
+        iconLocal = ShortCuts_Icons.icon("ShortCuts_Local")
+        iconGlobal = ShortCuts_Icons.icon("ShortCuts_Global")
+        iconLG = ShortCuts_Icons.icon("ShortCuts_LocalGlobal")
+        iconPref = ShortCuts_Icons.svgIcon("Preferences", iconSvgPref)
 
-    def keyDelay():
-        """
-        Set timer interval.
-        Start key delay timer.
-        """
-        timer.stop()
+        iconFreeCAD = QtGui.QIcon.fromTheme("freecad")
 
-        if paramGet.GetInt("Delay"):
-            timer.setInterval(paramGet.GetInt("Delay"))
+        if iconFreeCAD.isNull():
+            iconFreeCAD = iconNone
         else:
-            timer.setInterval(1000)
+            pass
 
-        timer.start()
+        styleEdit = """
+            QLineEdit {
+                border: 1px outset silver;
+            }"""
 
-    def onDelay():
-        """
-        Run the command on timer timeout.
-        """
-        action = None
-        text = edit.text().upper()
+        styleButtonPref = """
+            QToolButton {
+                border: 1px solid #1e1e1e;
+                background-color: #3c3c3c;
+            }"""
 
-        if text in currentCombinations:
-            action = currentCombinations[text]
-        else:
-            pass
+        styleContainer = """
+            QMenu {
+                background: transparent
+            }"""
 
-        if action and action.isEnabled():
-            setVisibility(mode=1)
-            action.trigger()
-        else:
-            pass
+        def wbIcon(i):
+            """
+            Create and return workbench icon.
+            Icons are cached in memory and on disk.
+            """
+            return ShortCuts_Icons.workbenchIcon(i, iconFreeCAD)
 
-    timer = delayTimer()
-    timer.setParent(mw)
-    timer.setSingleShot(True)
-    timer.timeout.connect(onDelay)
+        def actionList():
+            """
+            Return a dictionary of unique actions.
+            The registry keeps it current, no widget tree scan is needed.
+            """
+            return ShortCuts_Registry.getActions()
 
-    class ShortCutsEdit(QtGui.QLineEdit):
-        """
-        ShortCuts main line edit.
-        """
-        def __init__(self, parent=None):
-            super(ShortCutsEdit, self).__init__(parent)
+        def keyDelay():
+            """
+            Set timer interval.
+            Start key delay timer.
+            """
+            timer.stop()
+
+            if paramGet.GetInt("Delay"):
+                timer.setInterval(paramGet.GetInt("Delay"))
+            else:
+                timer.setInterval(1000)
 
-        def focusOutEvent(self, e):
+            timer.start()
+
+        def onDelay():
             """
-            Hide line edit when focus is lost.
+            Run the command on timer timeout.
             """
-            setVisibility()
+            runCombination(edit.text().upper())
 
-        def keyPressEvent(self, e):
+        def runCombination(text):
             """
-            Hide line edit on ESC key.
-            Show all available completions on down key.
+            Run the command bound to the combination.
             """
-            if e.key() == QtCore.Qt.Key_Escape:
-                setVisibility()
-            elif e.key() == QtCore.Qt.Key_Down:
-                edit.clear()
-                completer.setCompletionPrefix("")
-                completer.complete()
+            action = None
+
+            if text in currentCombinations:
+                action = currentCombinations[text]
             else:
-                QtGui.QLineEdit.keyPressEvent(self, e)
+                pass
 
-    def globalShortcuts():
-        """
-        Create a dictionary of available global shortcuts.
-        """
-        currentGlobal.clear()
-        index = paramGet.GetGroup("Global shortcuts").GetString("IndexList")
-        index = index.split(",")
+            if action and action.isEnabled():
+                setVisibility(mode=1)
+                action.trigger()
+            else:
+                pass
 
-        for i in index:
-            try:
-                command = (paramGet
-                           .GetGroup("Global shortcuts")
-                           .GetGroup(i)
-                           .GetString("command")
-                           .decode("UTF-8"))
-            except AttributeError:
-                command = (paramGet
-                           .GetGroup("Global shortcuts")
-                           .GetGroup(i)
-                           .GetString("command"))
+        timer = delayTimer()
+        timer.setParent(mw)
+        timer.setSingleShot(True)
+        timer.timeout.connect(onDelay)
+
+        class ShortCutsEdit(QtGui.QLineEdit):
+            """
+            ShortCuts main line edit.
+            """
+            def __init__(self, parent=None):
+                super(ShortCutsEdit, self).__init__(parent)
+
+            def focusOutEvent(self, e):
+                """
+                Hide line edit when focus is lost.
+                """
+                setVisibility()
+
+            def keyPressEvent(self, e):
+                """
+                Hide line edit on ESC key.
+                Show all available completions on down key.
+                """
+                if e.key() == QtCore.Qt.Key_Escape:
+                    setVisibility()
+                elif e.key() == QtCore.Qt.Key_Down:
+                    edit.clear()
+                    fuzzyResults("")
+                    completer.setCompletionPrefix("")
+                    completer.complete()
+                else:
+                    QtGui.QLineEdit.keyPressEvent(self, e)
+
+        def decoded(group, name):
+            """
+            Return decoded string from the group.
+            """
             try:
-                shortcut = (paramGet
-                            .GetGroup("Global shortcuts")
-                            .GetGroup(i)
-                            .GetString("shortcut")
-                            .decode("UTF-8"))
+                return group.GetString(name).decode("UTF-8")
             except AttributeError:
-                shortcut = (paramGet
-                            .GetGroup("Global shortcuts")
-                            .GetGroup(i)
-                            .GetString("shortcut"))
+                return group.GetString(name)
 
-            if command and shortcut:
-                currentGlobal[command] = shortcut
-            else:
-                index.remove(i)
-                paramGet.GetGroup("Global shortcuts").RemGroup(i)
+        def readShortcuts(name, target):
+            """
+            Read shortcuts of the database group into the target dictionary.
+            Read only, invalid entries are left for compactDatabase.
+            """
+            target.clear()
 
-        string = ",".join(index)
-        paramGet.GetGroup("Global shortcuts").SetString("IndexList", string)
+            if not paramGet.HasGroup(name):
+                return
 
-    def localShortcuts():
-        """
-        Create a dictionary of available local shortcuts.
-        """
-        currentLocal.clear()
-
-        if Gui.activeWorkbench().MenuText:
-            activeWB = Gui.activeWorkbench().MenuText
-        else:
-            activeWB = None
+            group = paramGet.GetGroup(name)
 
-        if activeWB:
-            index = paramGet.GetGroup(activeWB).GetString("IndexList")
-            index = index.split(",")
+            for i in group.GetString("IndexList").split(","):
+                if i and group.HasGroup(i):
+                    command = decoded(group.GetGroup(i), "command")
+                    shortcut = decoded(group.GetGroup(i), "shortcut")
 
-            for i in index:
-                try:
-                    command = (paramGet
-                               .GetGroup(activeWB)
-                               .GetGroup(i)
-                               .GetString("command")
-                               .decode("UTF-8"))
-                except AttributeError:
-                    command = (paramGet
-                               .GetGroup(activeWB)
-                               .GetGroup(i)
-                               .GetString("command"))
-                try:
-                    shortcut = (paramGet
-                                .GetGroup(activeWB)
-                                .GetGroup(i)
-                                .GetString("shortcut")
-                                .decode("UTF-8"))
-                except AttributeError:
-                    shortcut = (paramGet
-                                .GetGroup(activeWB)
-                                .GetGroup(i)
-                                .GetString("shortcut"))
-
-                if command and shortcut:
-                    currentLocal[command] = shortcut
+                    if command and shortcut:
+                        target[command] = shortcut
+                    else:
+                        pass
                 else:
-                    index.remove(i)
-                    paramGet.GetGroup(activeWB).RemGroup(i)
+                    pass
 
-            string = ",".join(index)
-            paramGet.GetGroup(activeWB).SetString("IndexList", string)
-        else:
-            pass
+        def compactDatabase():
+            """
+            Remove empty or invalid groups and rewrite index lists.
+            Runs once on start and on demand from preferences.
+            """
+            for name in paramGet.GetGroups():
+                group = paramGet.GetGroup(name)
+                index = group.GetString("IndexList").split(",")
+                keep = []
+
+                for i in index:
+                    if (i and
+                            i not in keep and
+                            group.HasGroup(i) and
+                            decoded(group.GetGroup(i), "command") and
+                            decoded(group.GetGroup(i), "shortcut")):
+                        keep.append(i)
+                    else:
+                        pass
 
-    def itemList(activeWB=None):
-        """
-        Create and return an alphabetically sorted list
-        of table widget items.
-        """
-        items = []
-        names = []
-        applyShortcuts()
-        actions = actionList()
-
-        for i in actions:
-            text = actions[i].text()
-            text = text.replace("&", "")
-            names.append([text, actions[i].objectName()])
-
-        names = sorted(names)
-
-        sort = []
-
-        for i in names:
-            sort.append(i[1])
-
-        for i in sort:
-            if i in actions:
-                command = QtGui.QTableWidgetItem()
-                text = actions[i].text()
-                text = text.replace("&", "")
-                command.setText(text)
-                command.setToolTip(actions[i].toolTip())
-                command.setFlags(QtCore.Qt.ItemIsEnabled)
-
-                if actions[i].icon():
-                    command.setIcon(actions[i].icon())
-                else:
-                    command.setIcon(QtGui.QIcon(iconPixNone))
-
-                shortcut = QtGui.QTableWidgetItem()
-
-                if (i in currentLocal and
-                        i in currentGlobal and
-                        activeWB != "Global shortcuts"):
-                    shortcut.setText(currentLocal[i])
-                    shortcut.setIcon(QtGui.QIcon(iconPixLG))
-                    shortcut.setToolTip(activeWB +
-                                        ": " +
-                                        currentLocal[i] +
-                                        "    Global: " +
-                                        currentGlobal[i])
-                elif i in currentLocal and activeWB != "Global shortcuts":
-                    shortcut.setText(currentLocal[i])
-                    shortcut.setIcon(QtGui.QIcon(iconPixLocal))
-                    shortcut.setToolTip(activeWB + ": " + currentLocal[i])
-                elif i in currentGlobal:
-                    shortcut.setText(currentGlobal[i])
-                    shortcut.setIcon(QtGui.QIcon(iconPixGlobal))
-                    shortcut.setToolTip("Global: " + currentGlobal[i])
+                for i in group.GetGroups():
+                    if i not in keep:
+                        group.RemGroup(i)
+                    else:
+                        pass
+
+                groupIndex.pop(name, None)
+
+                if not keep:
+                    paramGet.RemGroup(name)
+                elif keep != index:
+                    group.SetString("IndexList", ",".join(keep))
                 else:
                     pass
 
-                shortcut.setData(32, actions[i].objectName())
+        def globalShortcuts():
+            """
+            Create a dictionary of available global shortcuts.
+            """
+            readShortcuts("Global shortcuts", currentGlobal)
 
-                items.append([command, shortcut])
+        def localShortcuts():
+            """
+            Create a dictionary of available local shortcuts.
+            """
+            if Gui.activeWorkbench().MenuText:
+                readShortcuts(Gui.activeWorkbench().MenuText, currentLocal)
             else:
-                pass
+                currentLocal.clear()
 
-        return items
+        def commandList():
+            """
+            Create and return an alphabetically sorted list
+            of command names for the table model.
+            """
+            applyShortcuts()
 
-    def groupNum(activeWB, command):
-        """
-        Search for existing command group index number.
-        Define new command group index number if one does not exist yet.
-        """
-        indexNumber = None
-        index = paramGet.GetGroup(activeWB).GetString("IndexList")
-        index = index.split(",")
+            return ShortCuts_Registry.sortedActions()
 
-        for i in index:
+        # Workbench -> {"index": [n], "numbers": {command: n},
+        #               "free": [n], "next": n}
+        groupIndex = {}
+
+        def commandName(command):
+            """
+            Return command name as text.
+            """
             try:
-                if (paramGet
-                        .GetGroup(activeWB)
-                        .GetGroup(i)
-                        .GetString("command")
-                        .decode("UTF-8") == command):
-                    indexNumber = i
-                else:
-                    pass
+                return command.decode("UTF-8")
             except AttributeError:
-                if (paramGet
-                        .GetGroup(activeWB)
-                        .GetGroup(i)
-                        .GetString("command") == command):
-                    indexNumber = i
+                return command
+
+        def groupData(activeWB):
+            """
+            Return the reverse index and free numbers of the workbench group.
+            Built with a single pass over the group on first use.
+            """
+            if activeWB in groupIndex:
+                return groupIndex[activeWB]
+
+            group = paramGet.GetGroup(activeWB)
+            index = [i for i in group.GetString("IndexList").split(",") if i]
+            numbers = {}
+            used = set()
+
+            for i in index:
+                command = decoded(group.GetGroup(i), "command")
+
+                if command:
+                    numbers[command] = i
                 else:
                     pass
 
-        if not indexNumber:
-            x = 1
-            maxNum = 999
+                try:
+                    used.add(int(i))
+                except ValueError:
+                    pass
+
+            last = max(used) if used else 0
+            free = [x for x in range(1, last) if x not in used]
+            heapq.heapify(free)
+
+            data = {"index": index,
+                    "numbers": numbers,
+                    "free": free,
+                    "next": last + 1}
+            groupIndex[activeWB] = data
+
+            return data
+
+        def groupNum(activeWB, command):
+            """
+            Search for existing command group index number.
+            Define new command group index number if one does not exist yet.
+            """
+            data = groupData(activeWB)
+            command = commandName(command)
 
-            while str(x) in index and x < maxNum:
-                x += 1
+            if command in data["numbers"]:
+                return data["numbers"][command]
             else:
-                indexNumber = str(x)
+                pass
+
+            if data["free"]:
+                indexNumber = str(heapq.heappop(data["free"]))
+            else:
+                indexNumber = str(data["next"])
+                data["next"] += 1
 
-            if indexNumber and int(indexNumber) != maxNum:
-                index.append(indexNumber)
+            data["numbers"][command] = indexNumber
+            data["index"].append(indexNumber)
+            (paramGet
+             .GetGroup(activeWB)
+             .SetString("IndexList", ",".join(data["index"])))
+
+            return indexNumber
+
+        def deleteGroup(activeWB, command):
+            """
+            Delete the command data and corresponding group from the database.
+            """
+            data = groupData(activeWB)
+            command = commandName(command)
+
+            if command in data["numbers"]:
+                indexNumber = data["numbers"].pop(command)
+                data["index"].remove(indexNumber)
+                paramGet.GetGroup(activeWB).RemGroup(indexNumber)
                 (paramGet
                  .GetGroup(activeWB)
-                 .SetString("IndexList", ",".join(index)))
+                 .SetString("IndexList", ",".join(data["index"])))
+
+                try:
+                    heapq.heappush(data["free"], int(indexNumber))
+                except ValueError:
+                    pass
             else:
-                indexNumber = None
-        else:
-            pass
+                pass
 
-        return indexNumber
+        model = QtGui.QStandardItemModel()
+        model.setColumnCount(1)
 
-    def deleteGroup(activeWB, command):
-        """
-        Delete the command data and corresponding group from the database.
-        """
-        index = paramGet.GetGroup(activeWB).GetString("IndexList")
-        index = index.split(",")
+        # Completer model is kept alive and only patched when it is dirty
+        overlay = {"dirty": True, "loaded": False}
+        # (scope, command) -> [item, action, shortcut, slot]
+        rows = {}
 
-        for i in index:
-            try:
-                if (paramGet
-                        .GetGroup(activeWB)
-                        .GetGroup(i)
-                        .GetString("command")
-                        .decode("UTF-8") == command):
-                    index.remove(i)
-                    paramGet.GetGroup(activeWB).RemGroup(i)
-                    (paramGet
-                     .GetGroup(activeWB)
-                     .SetString("IndexList", ",".join(index)))
-                else:
-                    pass
-            except AttributeError:
-                if (paramGet
-                        .GetGroup(activeWB)
-                        .GetGroup(i)
-                        .GetString("command") == command):
-                    index.remove(i)
-                    paramGet.GetGroup(activeWB).RemGroup(i)
-                    (paramGet
-                     .GetGroup(activeWB)
-                     .SetString("IndexList", ",".join(index)))
+        def onRegistry(changed):
+            """
+            Mark the model dirty when bound actions appear or disappear.
+            """
+            for command in changed:
+                if command in currentLocal or command in currentGlobal:
+                    overlay["dirty"] = True
+                    break
                 else:
                     pass
 
-    model = QtGui.QStandardItemModel()
-    model.setColumnCount(1)
+        ShortCuts_Registry.connect(onRegistry)
 
-    def modelData():
-        """
-        Model data for completer.
-        Create a dictionary of unique shortcut combinations.
-        """
-        duplicates = []
-        applyShortcuts()
+        def addRow(key, action, shortcut):
+            """
+            Append completer item and follow action enabled state.
+            """
+            item = QtGui.QStandardItem()
+            item.setText(shortcut + "  " + action.text().replace("&", ""))
 
-        actions = actionList()
-        currentCombinations.clear()
+            if action.icon():
+                item.setIcon(action.icon())
+            else:
+                item.setIcon(iconNone)
 
-        if Gui.activeWorkbench().MenuText:
-            activeWB = Gui.activeWorkbench().MenuText
-        else:
-            activeWB = None
+            item.setToolTip(action.toolTip())
+            item.setEnabled(action.isEnabled())
+            item.setData(action.objectName(), 32)
 
-        row = 0
-        model.clear()
+            def onChanged():
+                """
+                Update item enabled state.
+                """
+                if item.isEnabled() != action.isEnabled():
+                    item.setEnabled(action.isEnabled())
+                else:
+                    pass
 
-        if activeWB:
-            for command in currentLocal:
-                if command in actions:
-                    item = QtGui.QStandardItem()
+            action.changed.connect(onChanged)
+            model.appendRow(item)
+            rows[key] = [item, action, shortcut, onChanged]
+            ShortCuts_Conflicts.bind(ShortCuts_Conflicts.OVERLAY,
+                                     key,
+                                     shortcut)
 
-                    shortcut = currentLocal[command]
+        def removeRow(key):
+            """
+            Remove completer item.
+            """
+            item, action, shortcut, slot = rows.pop(key)
 
-                    text = (shortcut +
-                            "  " +
-                            (actions[command].text()).replace("&", ""))
+            try:
+                action.changed.disconnect(slot)
+            except (RuntimeError, TypeError):
+                pass
 
-                    item.setText(text)
+            model.removeRow(item.row())
+            ShortCuts_Conflicts.bind(ShortCuts_Conflicts.OVERLAY, key, "")
 
-                    if actions[command].icon():
-                        item.setIcon(actions[command].icon())
-                    else:
-                        item.setIcon(QtGui.QIcon(iconPixNone))
+        def combinations():
+            """
+            Create a dictionary of unique shortcut combinations.
+            """
+            currentCombinations.clear()
+            conflicts = ShortCuts_Conflicts.index.get(
+                ShortCuts_Conflicts.OVERLAY, {})
 
-                    item.setToolTip(actions[command].toolTip())
-                    item.setEnabled(actions[command].isEnabled())
-                    item.setData(actions[command].objectName(), 32)
+            # Combinations shared by several rows are left out
+            for key in rows:
+                item, action, shortcut, slot = rows[key]
 
-                    model.setItem(row, 0, item)
-                    row += 1
+                if len(conflicts.get(ShortCuts_Conflicts.key(shortcut),
+                                     ())) == 1:
+                    currentCombinations[shortcut] = action
+                else:
+                    pass
 
-                    if shortcut in currentCombinations:
-                        if shortcut not in duplicates:
-                            duplicates.append(shortcut)
-                        else:
-                            pass
-                    else:
-                        currentCombinations[shortcut] = actions[command]
+            # Left out combinations stay in the trie, their prefixes are
+            # ambiguous and must not run another command
+            trie[0] = ShortCuts_Match.buildTrie(
+                set([rows[key][2] for key in rows]))
 
-            for command in currentGlobal:
-                if command in actions:
-                    item = QtGui.QStandardItem()
+            entries = {}
 
-                    shortcut = currentGlobal[command]
+            for key in rows:
+                item, action, shortcut, slot = rows[key]
+                entries[key] = (shortcut, action.text(), action.toolTip())
 
-                    text = (shortcut +
-                            "  " +
-                            (actions[command].text()).replace("&", ""))
+            fuzzy["index"] = ShortCuts_Match.buildIndex(entries)
 
-                    item.setText(text)
+        @ShortCuts_Instrument.timed("InitGui.modelData")
+        def modelData():
+            """
+            Model data for completer.
+            Patch the model only if shortcuts, workbench or actions changed.
+            """
+            if not overlay["loaded"]:
+                applyShortcuts()
+            else:
+                pass
 
-                    if actions[command].icon():
-                        item.setIcon(actions[command].icon())
-                    else:
-                        item.setIcon(QtGui.QIcon(iconPixNone))
+            completerMode()
 
-                    item.setToolTip(actions[command].toolTip())
-                    item.setEnabled(actions[command].isEnabled())
-                    item.setData(actions[command].objectName(), 32)
+            if not overlay["dirty"]:
+                return
 
-                    model.setItem(row, 0, item)
-                    row += 1
+            overlay["dirty"] = False
+            actions = actionList()
+            wanted = {}
 
-                    if shortcut in currentCombinations:
-                        if shortcut not in duplicates:
-                            duplicates.append(shortcut)
-                        else:
-                            pass
+            if Gui.activeWorkbench().MenuText:
+                for command in currentLocal:
+                    if command in actions:
+                        wanted[("Local", command)] = currentLocal[command]
                     else:
-                        currentCombinations[shortcut] = actions[command]
-
-            for d in duplicates:
-                del currentCombinations[d]
+                        pass
 
-    completer = QtGui.QCompleter()
-    completer.setModel(model)
-    completer.setMaxVisibleItems(16)
-    completer.popup().setMinimumWidth(220)
-    completer.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
+                for command in currentGlobal:
+                    if command in actions:
+                        wanted[("Global", command)] = currentGlobal[command]
+                    else:
+                        pass
+            else:
+                pass
 
-    def onHighlighted():
-        """
-        Stop the timer on down key.
-        Hide preferences button.
-        Increase line edit size.
-        """
-        timer.stop()
-        buttonPref.hide()
-        edit.setMinimumWidth(220)
+            for key in list(rows):
+                if (key not in wanted or
+                        rows[key][1] is not actions[key[1]] or
+                        rows[key][2] != wanted[key]):
+                    removeRow(key)
+                else:
+                    pass
 
-    completer.highlighted.connect(onHighlighted)
+            for key in wanted:
+                if key not in rows:
+                    addRow(key, actions[key[1]], wanted[key])
+                else:
+                    pass
 
-    def onCompleter(modelIndex):
-        """
-        Run selected command on completion.
-        Set visibility.
-        """
-        actions = actionList()
+            combinations()
 
-        index = completer.completionModel().mapToSource(modelIndex)
-        item = model.itemFromIndex(index)
-        data = item.data(32)
+        completer = QtGui.QCompleter()
+        completer.setModel(model)
+        completer.setMaxVisibleItems(16)
+        completer.popup().setMinimumWidth(220)
+        completer.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
 
-        if data in actions:
-            actions[data].trigger()
-        else:
-            pass
+        # Ranked results of fuzzy search
+        ranked = QtGui.QStandardItemModel()
+        ranked.setColumnCount(1)
+        fuzzy = {"enabled": False,
+                 "index": ShortCuts_Match.buildIndex({}),
+                 "limit": 50}
 
-        setVisibility(mode=1)
+        def completerMode():
+            """
+            Use ranked fuzzy results or prefix completion.
+            """
+            enabled = paramGet.GetBool("FuzzySearch", True)
 
-    completer.activated[QtCore.QModelIndex].connect(onCompleter)
+            if enabled == fuzzy["enabled"]:
+                return
 
-    edit = ShortCutsEdit()
-    edit.hide()
-    edit.setCompleter(completer)
-    edit.setStyleSheet(styleEdit)
-    edit.setGeometry(10, 10, 40, 24)
-    edit.setAlignment(QtCore.Qt.AlignHCenter)
-    edit.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
+            fuzzy["enabled"] = enabled
 
-    def onTextEdited(text):
-        """
-        Start the timer on last key.
-        Restore default line edit size.
-        """
-        if text:
-            if paramGet.GetBool("EnableDelay"):
-                keyDelay()
+            if enabled:
+                completer.setModel(ranked)
+                completer.setCompletionMode(QtGui.QCompleter
+                                            .UnfilteredPopupCompletion)
             else:
-                pass
-        else:
-            edit.setMinimumWidth(40)
-            edit.setGeometry(10, 10, 40, 24)
-            buttonPref.show()
+                completer.setModel(model)
+                completer.setCompletionMode(QtGui.QCompleter.PopupCompletion)
 
-    edit.textEdited.connect(onTextEdited)
+        def fuzzyResults(text):
+            """
+            Fill the ranked model with best matches for the text.
+            """
+            if not fuzzy["enabled"]:
+                return
 
-    def onReturnPressed():
-        """
-        Clear or hide line edit after enter key is pressed.
-        """
-        if edit.text():
-            edit.clear()
-        else:
-            setVisibility()
+            if text:
+                limit = fuzzy["limit"]
+            else:
+                limit = None
 
-    edit.returnPressed.connect(onReturnPressed)
+            ranked.clear()
 
-    buttonPref = QtGui.QToolButton()
-    buttonPref.hide()
-    buttonPref.setGeometry(60, 10, 24, 24)
-    buttonPref.setStyleSheet(styleButtonPref)
+            for key in ShortCuts_Match.search(fuzzy["index"], text, limit):
+                ranked.appendRow(rows[key][0].clone())
 
-    actionPref = QtGui.QAction(buttonPref)
-    actionPref.setIcon(QtGui.QIcon(iconPixPref))
+        def onHighlighted():
+            """
+            Stop the timer on down key.
+            Hide preferences button.
+            Increase line edit size.
+            """
+            timer.stop()
+            buttonPref.hide()
+            edit.setMinimumWidth(220)
 
-    buttonPref.setDefaultAction(actionPref)
+        completer.highlighted.connect(onHighlighted)
 
-    def onPreferences():
-        """
-        Delete existing preferences dialog if it exists.
-        Open new preferences dialog.
-        """
-        for i in mw.findChildren(QtGui.QDialog):
-            if i.objectName() == "ShortCuts":
-                i.deleteLater()
+        def onCompleter(modelIndex):
+            """
+            Run selected command on completion.
+            Set visibility.
+            """
+            index = completer.completionModel().mapToSource(modelIndex)
+            item = completer.model().itemFromIndex(index)
+            action = ShortCuts_Registry.lookup(item.data(32))
+
+            if action:
+                action.trigger()
             else:
                 pass
 
-        dialog = prefDialog()
-        dialog.show()
+            setVisibility(mode=1)
 
-    buttonPref.triggered.connect(onPreferences)
+        completer.activated[QtCore.QModelIndex].connect(onCompleter)
 
-    currentLocal = {}
-    currentGlobal = {}
-    currentCombinations = {}
+        edit = ShortCutsEdit()
+        edit.hide()
+        edit.setCompleter(completer)
+        edit.setStyleSheet(styleEdit)
+        edit.setGeometry(10, 10, 40, 24)
+        edit.setAlignment(QtCore.Qt.AlignHCenter)
+        edit.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
 
-    if macOS:
-        menu = QtGui.QMenu(mw)
-        menu.setParent(mw)
-        menu.setMinimumWidth(236)
-        menu.setMinimumHeight(36)
-        menu.setGeometry(0, 0, 236, 36)
-        menu.setStyleSheet(styleContainer)
-        menu.setAttribute(QtCore.Qt.WA_TranslucentBackground)
-        menu.setWindowFlags(menu.windowFlags() | QtCore.Qt.FramelessWindowHint)
+        def onTextEdited(text):
+            """
+            Run the command as soon as the combination is unambiguous.
+            Start the timer if the combination is a prefix of a longer one.
+            Restore default line edit size.
+            Update fuzzy search results.
+            """
+            fuzzyResults(text)
 
-        edit.setParent(menu)
-        buttonPref.setParent(menu)
-    else:
-        edit.setParent(mdi)
-        buttonPref.setParent(mdi)
+            if text:
+                if paramGet.GetBool("EnableDelay"):
+                    seq, wait = ShortCuts_Match.lookup(trie[0], text.upper())
 
-    def setVisibility(mode=0):
-        """
-        Restore default line edit size.
-        Show or hide ShortCuts.
-        """
-        mdi = mw.findChild(QtGui.QMdiArea)
+                    if wait:
+                        keyDelay()
+                    elif seq:
+                        timer.stop()
+                        runCombination(seq)
+                    else:
+                        timer.stop()
+                else:
+                    pass
+            else:
+                edit.setMinimumWidth(40)
+                edit.setGeometry(10, 10, 40, 24)
+                buttonPref.show()
 
-        edit.setMinimumWidth(40)
-        edit.setGeometry(10, 10, 40, 24)
+        edit.textEdited.connect(onTextEdited)
 
-        if macOS:
-            if menu.isVisible() or mode == 1:
-                timer.stop()
-                edit.clear()
-                menu.hide()
-                completer.popup().hide()
-                mdi.setFocus()
-            else:
-                modelData()
-                edit.clear()
-                menu.popup(QtCore.QPoint(mw.geometry().x() + mdi.pos().x(),
-                                         mw.geometry().y() + mdi.pos().y()))
-                edit.setVisible(True)
-                buttonPref.setVisible(True)
-                edit.setFocus()
-        else:
-            if edit.isVisible() or mode == 1:
-                timer.stop()
+        def onReturnPressed():
+            """
+            Clear or hide line edit after enter key is pressed.
+            """
+            if edit.text():
                 edit.clear()
-                edit.hide()
-                completer.popup().hide()
-                buttonPref.hide()
-                mdi.setFocus()
             else:
-                modelData()
-                edit.show()
-                edit.clear()
-                buttonPref.show()
-                edit.setFocus()
+                setVisibility()
 
-    invokeKey = QtGui.QAction(mw)
-    invokeKey.setAutoRepeat(False)
-    invokeKey.setText("Invoke shortcuts overlay")
-    invokeKey.setObjectName("InvokeShortCutsOverlay")
-    invokeKey.setShortcut(QtGui.QKeySequence("Shift+Q"))
-    invokeKey.triggered.connect(setVisibility)
+        edit.returnPressed.connect(onReturnPressed)
 
-    mw.addAction(invokeKey)
+        buttonPref = QtGui.QToolButton()
+        buttonPref.hide()
+        buttonPref.setGeometry(60, 10, 24, 24)
+        buttonPref.setStyleSheet(styleButtonPref)
 
-    def applyShortcuts():
-        """
-        Apply global and local shortcuts.
-        """
-        globalShortcuts()
-        localShortcuts()
+        actionPref = QtGui.QAction(buttonPref)
+        actionPref.setIcon(iconPref)
 
-    def prefDialog():
-        """
-        Preferences dialog.
-        """
+        buttonPref.setDefaultAction(actionPref)
 
-        class DelaySpinBox(QtGui.QSpinBox):
+        def onPreferences():
             """
-            Delay SpinBox focus behaviour.
+            Delete existing preferences dialog if it exists.
+            Open new preferences dialog.
             """
-            def __init__(self, parent=None):
-                super(DelaySpinBox, self).__init__(parent)
-
-            def keyPressEvent(self, e):
-                """
-                Set focus (button Done) on Return key pressed.
-                """
-                if e.key() == QtCore.Qt.Key_Return:
-                    buttonDone.setFocus()
+            for i in mw.findChildren(QtGui.QDialog):
+                if i.objectName() == "ShortCuts":
+                    i.deleteLater()
                 else:
-                    QtGui.QSpinBox.keyPressEvent(self, e)
+                    pass
+
+            dialog = prefDialog()
+            dialog.show()
+
+        buttonPref.triggered.connect(onPreferences)
 
-        def comboBox():
+        currentLocal = {}
+        currentGlobal = {}
+        currentCombinations = {}
+        trie = [ShortCuts_Match.buildTrie({})]
+
+        if macOS:
+            menu = QtGui.QMenu(mw)
+            menu.setParent(mw)
+            menu.setMinimumWidth(236)
+            menu.setMinimumHeight(36)
+            menu.setGeometry(0, 0, 236, 36)
+            menu.setStyleSheet(styleContainer)
+            menu.setAttribute(QtCore.Qt.WA_TranslucentBackground)
+            menu.setWindowFlags(menu.windowFlags() |
+                                QtCore.Qt.FramelessWindowHint)
+
+            edit.setParent(menu)
+            buttonPref.setParent(menu)
+        else:
+            edit.setParent(mdi)
+            buttonPref.setParent(mdi)
+
+        @ShortCuts_Instrument.timed("InitGui.setVisibility")
+        def setVisibility(mode=0):
             """
-            Workbench selector combo box.
+            Restore default line edit size.
+            Show or hide ShortCuts.
             """
-            cBox = QtGui.QComboBox()
-            cBox.setMinimumWidth(220)
+            mdi = mw.findChild(QtGui.QMdiArea)
 
-            listWB = Gui.listWorkbenches()
-            listWBSorted = sorted(listWB)
-            listWBSorted.reverse()
-
-            for i in listWBSorted:
-                if i in listWB:
-                    try:
-                        icon = wbIcon(Gui.listWorkbenches()[i].Icon)
-                    except AttributeError:
-                        icon = iconFreeCAD
+            edit.setMinimumWidth(40)
+            edit.setGeometry(10, 10, 40, 24)
 
-                    cBox.insertItem(0, icon, listWB[i].MenuText)
+            if macOS:
+                if menu.isVisible() or mode == 1:
+                    timer.stop()
+                    edit.clear()
+                    menu.hide()
+                    completer.popup().hide()
+                    mdi.setFocus()
+                else:
+                    with ShortCuts_Instrument.span("overlay",
+                                                   workbench=Gui
+                                                   .activeWorkbench()
+                                                   .MenuText) as s:
+                        modelData()
+                        s.args["rows"] = len(rows)
+                    edit.clear()
+                    menu.popup(QtCore.QPoint(mw.geometry().x() +
+                                             mdi.pos().x(),
+                                             mw.geometry().y() +
+                                             mdi.pos().y()))
+                    edit.setVisible(True)
+                    buttonPref.setVisible(True)
+                    edit.setFocus()
+            else:
+                if edit.isVisible() or mode == 1:
+                    timer.stop()
+                    edit.clear()
+                    edit.hide()
+                    completer.popup().hide()
+                    buttonPref.hide()
+                    mdi.setFocus()
+                else:
+                    with ShortCuts_Instrument.span("overlay",
+                                                   workbench=Gui
+                                                   .activeWorkbench()
+                                                   .MenuText) as s:
+                        modelData()
+                        s.args["rows"] = len(rows)
+                    edit.show()
+                    edit.clear()
+                    buttonPref.show()
+                    edit.setFocus()
+
+        def applyShortcuts():
+            """
+            Apply global and local shortcuts.
+            Mark completer model dirty if shortcuts changed.
+            """
+            old = (dict(currentLocal), dict(currentGlobal))
 
-            cBox.insertSeparator(0)
-            icon = iconFreeCAD
-            cBox.insertItem(0, icon, "Global shortcuts")
-            cBox.setCurrentIndex(0)
+            globalShortcuts()
+            localShortcuts()
 
-            activeWB = Gui.activeWorkbench().MenuText
+            if (not overlay["loaded"] or
+                    old != (currentLocal, currentGlobal)):
+                overlay["loaded"] = True
+                overlay["dirty"] = True
+            else:
+                pass
 
-            for count in range(cBox.count()):
+        def prefDialog():
+            """
+            Preferences dialog.
+            """
 
-                if cBox.itemText(count) == activeWB:
-                    cBox.setCurrentIndex(count)
-                else:
-                    pass
+            class DelaySpinBox(QtGui.QSpinBox):
+                """
+                Delay SpinBox focus behaviour.
+                """
+                def __init__(self, parent=None):
+                    super(DelaySpinBox, self).__init__(parent)
+
+                def keyPressEvent(self, e):
+                    """
+                    Set focus (button Done) on Return key pressed.
+                    """
+                    if e.key() == QtCore.Qt.Key_Return:
+                        buttonDone.setFocus()
+                    else:
+                        QtGui.QSpinBox.keyPressEvent(self, e)
 
-            def onCurrentIndexChanged():
+            def comboBox():
                 """
-                Activate workbench on selection.
+                Workbench selector combo box.
                 """
+                cBox = QtGui.QComboBox()
+                cBox.setMinimumWidth(220)
+
                 listWB = Gui.listWorkbenches()
+                listWBSorted = sorted(listWB)
+                listWBSorted.reverse()
+
+                for i in listWBSorted:
+                    if i in listWB:
+                        try:
+                            icon = wbIcon(listWB[i].Icon)
+                        except AttributeError:
+                            icon = iconFreeCAD
+
+                        cBox.insertItem(0, icon, listWB[i].MenuText)
 
-                for i in listWB:
-                    if listWB[i].MenuText == cBox.currentText():
-                        Gui.activateWorkbench(i)
+                cBox.insertSeparator(0)
+                icon = iconFreeCAD
+                cBox.insertItem(0, icon, "Global shortcuts")
+                cBox.setCurrentIndex(0)
+
+                activeWB = Gui.activeWorkbench().MenuText
+
+                for count in range(cBox.count()):
+
+                    if cBox.itemText(count) == activeWB:
+                        cBox.setCurrentIndex(count)
                     else:
                         pass
 
-                updateStats()
-                updateTable()
+                def onCurrentIndexChanged():
+                    """
+                    Activate workbench on selection.
+                    """
+                    listWB = Gui.listWorkbenches()
 
-            cBox.currentIndexChanged.connect(onCurrentIndexChanged)
+                    for i in listWB:
+                        if listWB[i].MenuText == cBox.currentText():
+                            Gui.activateWorkbench(i)
+                        else:
+                            pass
 
-            return cBox
+                    updateStats()
+                    updateTable()
 
-        def tableWidget():
-            """
-            Table of commands and shortcuts.
-            """
-            table = QtGui.QTableWidget(0, 2)
-            table.verticalHeader().setVisible(False)
-            table.setHorizontalHeaderLabels(["Command", "Shortcut"])
-            try:
-                table.horizontalHeader().setResizeMode(QtGui
-                                                       .QHeaderView
-                                                       .Stretch)
-            except AttributeError:
-                table.horizontalHeader().setSectionResizeMode(QtGui
-                                                              .QHeaderView
-                                                              .Stretch)
+                cBox.currentIndexChanged.connect(onCurrentIndexChanged)
+
+                return cBox
+
+            def shortcutText(command):
+                """
+                Shortcut displayed for the command.
+                """
+                if (command in currentLocal and
+                        cBox.currentText() != "Global shortcuts"):
+                    return currentLocal[command]
+                elif command in currentGlobal:
+                    return currentGlobal[command]
+                else:
+                    return ""
+
+            def shortcutIcon(command):
+                """
+                Local, global or local and global indicator.
+                """
+                local = (command in currentLocal and
+                         cBox.currentText() != "Global shortcuts")
+
+                if local and command in currentGlobal:
+                    return iconLG
+                elif local:
+                    return iconLocal
+                elif command in currentGlobal:
+                    return iconGlobal
+                else:
+                    return None
+
+            def shortcutTip(command):
+                """
+                Local and global shortcut tooltip.
+                """
+                activeWB = cBox.currentText()
+                local = (command in currentLocal and
+                         activeWB != "Global shortcuts")
+
+                if local and command in currentGlobal:
+                    return (activeWB +
+                            ": " +
+                            currentLocal[command] +
+                            "    Global: " +
+                            currentGlobal[command])
+                elif local:
+                    return activeWB + ": " + currentLocal[command]
+                elif command in currentGlobal:
+                    return "Global: " + currentGlobal[command]
+                else:
+                    return None
 
-            def onItemChanged(item):
+            def onEdit(command, text):
                 """
                 Save shortcut.
                 Delete command from database if no shortcut is provided.
                 """
                 activeWB = cBox.currentText()
 
-                if item.text() and activeWB and item.data(32):
+                if text and activeWB and command:
                     try:
                         indexNumber = groupNum(activeWB,
-                                               item.data(32).encode("UTF-8"))
+                                               command.encode("UTF-8"))
                     except TypeError:
-                        indexNumber = groupNum(activeWB,
-                                               item.data(32))
+                        indexNumber = groupNum(activeWB, command)
 
                     if indexNumber:
                         try:
@@ -848,241 +923,350 @@ def shortCuts():
                              .GetGroup(activeWB)
                              .GetGroup(indexNumber)
                              .SetString("command",
-                                        item.data(32).encode("UTF-8")))
+                                        command.encode("UTF-8")))
                         except TypeError:
                             (paramGet
                              .GetGroup(activeWB)
                              .GetGroup(indexNumber)
-                             .SetString("command", item.data(32)))
+                             .SetString("command", command))
                         try:
                             (paramGet
                              .GetGroup(activeWB)
                              .GetGroup(indexNumber)
                              .SetString("shortcut",
-                                        item.text().upper().encode("UTF-8")))
+                                        text.upper().encode("UTF-8")))
                         except TypeError:
                             (paramGet
                              .GetGroup(activeWB)
                              .GetGroup(indexNumber)
-                             .SetString("shortcut",
-                                        item.text().upper()))
+                             .SetString("shortcut", text.upper()))
                     else:
-                        print("ShortCuts: " + activeWB + " database is full.")
-                elif activeWB and item.data(32):
+                        pass
+                elif activeWB and command:
                     try:
-                        deleteGroup(activeWB, item.data(32).encode("UTF-8"))
+                        deleteGroup(activeWB, command.encode("UTF-8"))
                     except TypeError:
-                        deleteGroup(activeWB, item.data(32))
+                        deleteGroup(activeWB, command)
                 else:
                     pass
 
+                # Only the edited row is refreshed by the model
+                applyShortcuts()
+                updateStats()
+
+            def tableWidget():
+                """
+                Table view of commands and shortcuts.
+                Cell data is produced lazily by the model.
+                """
+                model = ShortCuts_Model.TableModel(shortcutText,
+                                                   shortcutIcon,
+                                                   shortcutTip,
+                                                   onEdit,
+                                                   iconNone)
+                table = ShortCuts_Model.tableView(model)
+                model.setParent(table)
+
+                return table
+
+            def updateTable():
+                """
+                Update table model.
+                """
+                with ShortCuts_Instrument.span("preferences",
+                                               workbench=cBox
+                                               .currentText()) as s:
+                    table.model().setCommands(commandList())
+                    s.args["rows"] = table.model().rowCount()
+
+            def updateStats():
+                """
+                Update statistic information for current number of shortcuts.
+                """
+                activeWB = cBox.currentText()
+
+                if activeWB == "<none>":
+                    activeWB = "None"
+                else:
+                    pass
+
+                if activeWB == "Global shortcuts":
+                    stats.setText("<br>" +
+                                  "Global: " +
+                                  "<b>" + str(len(currentGlobal)) + "</b>")
+                else:
+                    stats.setText(activeWB +
+                                  ": " +
+                                  "<b>" + str(len(currentLocal)) + "</b>" +
+                                  "<br>" +
+                                  "Global: " +
+                                  "<b>" + str(len(currentGlobal)) + "</b>")
+
+            def onCheckDelay():
+                """
+                Save enable or disable autorun command state.
+                """
+                if checkDelay.isChecked():
+                    paramGet.SetBool("EnableDelay", 1)
+                    spinDelay.setEnabled(True)
+                else:
+                    paramGet.SetBool("EnableDelay", 0)
+                    spinDelay.setEnabled(False)
+
+            def onSpinDelay(i):
+                """
+                Save delay time setting.
+                """
+                paramGet.SetInt("Delay", i)
+
+            def onCompact():
+                """
+                Compact the database and refresh the table.
+                """
+                compactDatabase()
                 applyShortcuts()
                 updateTable()
                 updateStats()
 
-            table.itemChanged.connect(onItemChanged)
+            def onCheckFuzzy():
+                """
+                Save enable or disable fuzzy search state.
+                """
+                if checkFuzzy.isChecked():
+                    paramGet.SetBool("FuzzySearch", 1)
+                else:
+                    paramGet.SetBool("FuzzySearch", 0)
 
-            return table
+            dialog = QtGui.QDialog(mw)
+            dialog.resize(800, 450)
+            dialog.setWindowTitle("ShortCuts")
+            dialog.setObjectName("ShortCuts")
 
-        def updateTable():
-            """
-            Update table items.
-            """
-            items = itemList(cBox.currentText())
+            cBox = comboBox()
+            cBox.setParent(dialog)
 
-            table.blockSignals(True)
-            table.setRowCount(len(items))
+            table = tableWidget()
+            table.setParent(dialog)
 
-            row = 0
+            stats = QtGui.QLabel()
+            stats.setAlignment(QtCore.Qt.AlignRight)
 
-            for i in items:
-                table.setItem(row, 0, i[0])
-                table.setItem(row, 1, i[1])
-                row += 1
+            home = QtGui.QWidget(dialog)
+            layoutHome = QtGui.QVBoxLayout()
+            home.setLayout(layoutHome)
 
-            table.blockSignals(False)
+            settings = QtGui.QWidget(dialog)
+            layoutSettings = QtGui.QVBoxLayout()
+            settings.setLayout(layoutSettings)
 
-        def updateStats():
-            """
-            Update statistic information for current number of shortcuts.
-            """
-            activeWB = cBox.currentText()
+            stack = QtGui.QStackedWidget(dialog)
+            stack.insertWidget(0, home)
+            stack.insertWidget(1, settings)
 
-            if activeWB == "<none>":
-                activeWB = "None"
-            else:
-                pass
+            buttonClose = QtGui.QPushButton("Close", home)
+            buttonSettings = QtGui.QPushButton("Settings", home)
+            buttonDone = QtGui.QPushButton("Done", settings)
 
-            if activeWB == "Global shortcuts":
-                stats.setText("<br>" +
-                              "Global: " +
-                              "<b>" + str(len(currentGlobal)) + "</b>")
-            else:
-                stats.setText(activeWB +
-                              ": " +
-                              "<b>" + str(len(currentLocal)) + "</b>" +
-                              "<br>" +
-                              "Global: " +
-                              "<b>" + str(len(currentGlobal)) + "</b>")
-
-        def onCheckDelay():
-            """
-            Save enable or disable autorun command state.
-            """
-            if checkDelay.isChecked():
-                paramGet.SetBool("EnableDelay", 1)
-                spinDelay.setEnabled(True)
-            else:
-                paramGet.SetBool("EnableDelay", 0)
-                spinDelay.setEnabled(False)
+            labelDelay = QtGui.QLabel("Key delay:", dialog)
+            checkDelay = QtGui.QCheckBox(dialog)
+            checkDelay.stateChanged.connect(onCheckDelay)
 
-        def onSpinDelay(i):
-            """
-            Save delay time setting.
-            """
-            paramGet.SetInt("Delay", i)
+            spinDelay = DelaySpinBox()
+            spinDelay.setParent(dialog)
+            spinDelay.setSingleStep(50)
+            spinDelay.setRange(200, 9999)
+            spinDelay.setSuffix(" ms")
+            spinDelay.valueChanged.connect(onSpinDelay)
 
-        dialog = QtGui.QDialog(mw)
-        dialog.resize(800, 450)
-        dialog.setWindowTitle("ShortCuts")
-        dialog.setObjectName("ShortCuts")
+            labelCompact = QtGui.QLabel("Remove invalid entries:", dialog)
+            buttonCompact = QtGui.QPushButton("Compact", dialog)
+            buttonCompact.clicked.connect(onCompact)
 
-        cBox = comboBox()
-        cBox.setParent(dialog)
+            labelFuzzy = QtGui.QLabel("Fuzzy search:", dialog)
+            checkFuzzy = QtGui.QCheckBox(dialog)
+            checkFuzzy.stateChanged.connect(onCheckFuzzy)
 
-        table = tableWidget()
-        table.setParent(dialog)
+            layout = QtGui.QVBoxLayout()
+            dialog.setLayout(layout)
+            layout.setContentsMargins(0, 0, 0, 0)
+            layout.addWidget(stack)
 
-        stats = QtGui.QLabel()
-        stats.setAlignment(QtCore.Qt.AlignRight)
+            layoutScope = QtGui.QHBoxLayout()
+            layoutScope.addWidget(cBox)
+            layoutScope.addStretch(1)
+            layoutScope.addWidget(stats)
 
-        home = QtGui.QWidget(dialog)
-        layoutHome = QtGui.QVBoxLayout()
-        home.setLayout(layoutHome)
+            layoutBottom = QtGui.QHBoxLayout()
+            layoutBottom.addWidget(buttonSettings)
+            layoutBottom.addStretch(1)
+            layoutBottom.addWidget(buttonClose)
 
-        settings = QtGui.QWidget(dialog)
-        layoutSettings = QtGui.QVBoxLayout()
-        settings.setLayout(layoutSettings)
+            layoutHome.insertLayout(0, layoutScope)
+            layoutHome.addWidget(table)
+            layoutHome.insertLayout(2, layoutBottom)
 
-        stack = QtGui.QStackedWidget(dialog)
-        stack.insertWidget(0, home)
-        stack.insertWidget(1, settings)
+            layoutSettingsBottom = QtGui.QHBoxLayout()
+            layoutSettingsBottom.addWidget(buttonDone)
+            layoutSettingsBottom.addStretch(1)
 
-        buttonClose = QtGui.QPushButton("Close", home)
-        buttonSettings = QtGui.QPushButton("Settings", home)
-        buttonDone = QtGui.QPushButton("Done", settings)
+            layoutDelay = QtGui.QHBoxLayout()
+            layoutDelay.insertWidget(0, labelDelay)
+            layoutDelay.addStretch(1)
+            layoutDelay.insertWidget(2, checkDelay)
 
-        labelDelay = QtGui.QLabel("Key delay:", dialog)
-        checkDelay = QtGui.QCheckBox(dialog)
-        checkDelay.stateChanged.connect(onCheckDelay)
+            layoutDelaySpin = QtGui.QHBoxLayout()
+            layoutDelaySpin.addStretch(1)
+            layoutDelaySpin.insertWidget(1, spinDelay)
 
-        spinDelay = DelaySpinBox()
-        spinDelay.setParent(dialog)
-        spinDelay.setSingleStep(50)
-        spinDelay.setRange(200, 9999)
-        spinDelay.setSuffix(" ms")
-        spinDelay.valueChanged.connect(onSpinDelay)
+            groupTrigger = QtGui.QGroupBox("Autorun command")
 
-        layout = QtGui.QVBoxLayout()
-        dialog.setLayout(layout)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(stack)
+            layoutTrigger = QtGui.QVBoxLayout()
+            groupTrigger.setLayout(layoutTrigger)
 
-        layoutScope = QtGui.QHBoxLayout()
-        layoutScope.addWidget(cBox)
-        layoutScope.addStretch(1)
-        layoutScope.addWidget(stats)
+            layoutTrigger.insertLayout(0, layoutDelay)
+            layoutTrigger.insertLayout(1, layoutDelaySpin)
 
-        layoutBottom = QtGui.QHBoxLayout()
-        layoutBottom.addWidget(buttonSettings)
-        layoutBottom.addStretch(1)
-        layoutBottom.addWidget(buttonClose)
+            layoutFuzzy = QtGui.QHBoxLayout()
+            layoutFuzzy.insertWidget(0, labelFuzzy)
+            layoutFuzzy.addStretch(1)
+            layoutFuzzy.insertWidget(2, checkFuzzy)
 
-        layoutHome.insertLayout(0, layoutScope)
-        layoutHome.addWidget(table)
-        layoutHome.insertLayout(2, layoutBottom)
+            groupCompleter = QtGui.QGroupBox("Completer")
 
-        layoutSettingsBottom = QtGui.QHBoxLayout()
-        layoutSettingsBottom.addWidget(buttonDone)
-        layoutSettingsBottom.addStretch(1)
+            layoutCompleter = QtGui.QVBoxLayout()
+            groupCompleter.setLayout(layoutCompleter)
 
-        layoutDelay = QtGui.QHBoxLayout()
-        layoutDelay.insertWidget(0, labelDelay)
-        layoutDelay.addStretch(1)
-        layoutDelay.insertWidget(2, checkDelay)
+            layoutCompleter.insertLayout(0, layoutFuzzy)
 
-        layoutDelaySpin = QtGui.QHBoxLayout()
-        layoutDelaySpin.addStretch(1)
-        layoutDelaySpin.insertWidget(1, spinDelay)
+            layoutCompact = QtGui.QHBoxLayout()
+            layoutCompact.insertWidget(0, labelCompact)
+            layoutCompact.addStretch(1)
+            layoutCompact.insertWidget(2, buttonCompact)
 
-        groupTrigger = QtGui.QGroupBox("Autorun command")
+            groupDatabase = QtGui.QGroupBox("Database")
 
-        layoutTrigger = QtGui.QVBoxLayout()
-        groupTrigger.setLayout(layoutTrigger)
+            layoutDatabase = QtGui.QVBoxLayout()
+            groupDatabase.setLayout(layoutDatabase)
 
-        layoutTrigger.insertLayout(0, layoutDelay)
-        layoutTrigger.insertLayout(1, layoutDelaySpin)
+            layoutDatabase.insertLayout(0, layoutCompact)
 
-        layoutSettings.addWidget(groupTrigger)
-        layoutSettings.addStretch(1)
-        layoutSettings.insertLayout(2, layoutSettingsBottom)
+            layoutSettings.addWidget(groupTrigger)
+            layoutSettings.addWidget(groupCompleter)
+            layoutSettings.addWidget(groupDatabase)
+            layoutSettings.addStretch(1)
+            layoutSettings.insertLayout(4, layoutSettingsBottom)
 
-        def onAccepted():
-            """
-            Close dialog on button close.
-            """
-            dialog.done(1)
+            def onAccepted():
+                """
+                Close dialog on button close.
+                """
+                dialog.done(1)
 
-        buttonClose.clicked.connect(onAccepted)
+            buttonClose.clicked.connect(onAccepted)
 
-        def onFinished():
-            """
-            Delete dialog on close.
-            """
-            dialog.deleteLater()
+            def onFinished():
+                """
+                Delete dialog on close.
+                """
+                dialog.deleteLater()
 
-        dialog.finished.connect(onFinished)
+            dialog.finished.connect(onFinished)
 
-        def onSettings():
-            """
-            Change to settings on button settings.
-            """
-            stack.setCurrentIndex(1)
+            def onSettings():
+                """
+                Change to settings on button settings.
+                """
+                stack.setCurrentIndex(1)
 
-        buttonSettings.clicked.connect(onSettings)
+            buttonSettings.clicked.connect(onSettings)
 
-        def onDone():
-            """
-            Change to home on button done.
-            """
-            stack.setCurrentIndex(0)
-            buttonClose.setFocus()
+            def onDone():
+                """
+                Change to home on button done.
+                """
+                stack.setCurrentIndex(0)
+                buttonClose.setFocus()
 
-        buttonDone.clicked.connect(onDone)
+            buttonDone.clicked.connect(onDone)
 
-        def prefDefaults():
-            """
-            Set preferences default values.
-            """
+            def prefDefaults():
+                """
+                Set preferences default values.
+                """
 
-            if paramGet.GetBool("EnableDelay"):
-                checkDelay.setChecked(True)
-                spinDelay.setEnabled(True)
-            else:
-                checkDelay.setChecked(False)
-                spinDelay.setEnabled(False)
+                if paramGet.GetBool("EnableDelay"):
+                    checkDelay.setChecked(True)
+                    spinDelay.setEnabled(True)
+                else:
+                    checkDelay.setChecked(False)
+                    spinDelay.setEnabled(False)
 
-            if paramGet.GetInt("Delay"):
-                spinDelay.setValue(paramGet.GetInt("Delay"))
-            else:
-                spinDelay.setValue(1000)
+                if paramGet.GetInt("Delay"):
+                    spinDelay.setValue(paramGet.GetInt("Delay"))
+                else:
+                    spinDelay.setValue(1000)
+
+                if paramGet.GetBool("FuzzySearch", True):
+                    checkFuzzy.setChecked(True)
+                else:
+                    checkFuzzy.setChecked(False)
+
+                updateTable()
+                updateStats()
+
+            prefDefaults()
+
+            return dialog
 
-            updateTable()
-            updateStats()
+        compactDatabase()
 
-        prefDefaults()
+        instance["visibility"] = setVisibility
+        instance["apply"] = applyShortcuts
+        instance["modelData"] = modelData
+        instance["commandList"] = commandList
 
-        return dialog
+        App.Console.PrintLog("ShortCuts: overlay built in " +
+                             str(int((time.time() - timeBuild) * 1000)) +
+                             " ms\n")
+
+        return instance
+
+    def onInvoke():
+        """
+        Show or hide the overlay, build it first if needed.
+        """
+        build()["visibility"]()
+
+    def onWorkbenchActivated():
+        """
+        Apply shortcuts if the overlay exists.
+        """
+        if instance:
+            with ShortCuts_Instrument.span("workbench",
+                                           workbench=Gui
+                                           .activeWorkbench()
+                                           .MenuText):
+                instance["apply"]()
+        else:
+            pass
+
+    invokeKey = QtGui.QAction(mw)
+    invokeKey.setAutoRepeat(False)
+    invokeKey.setText("Invoke shortcuts overlay")
+    invokeKey.setObjectName("InvokeShortCutsOverlay")
+    invokeKey.setShortcut(QtGui.QKeySequence("Shift+Q"))
+    invokeKey.triggered.connect(onInvoke)
+
+    mw.addAction(invokeKey)
+
+    if not paramGet.GetBool("LazyOverlay", True):
+        build()
+    else:
+        pass
+
+    App.Console.PrintLog("ShortCuts: overlay import took " +
+                         str(int((time.time() - timeImport) * 1000)) +
+                         " ms\n")
 
     def onStart():
         """Start shortcuts."""
@@ -1095,22 +1279,19 @@ def shortCuts():
             pass
 
         if start:
-            startTimer.stop()
-            startTimer.deleteLater()
-            mw.workbenchActivated.connect(applyShortcuts)
+            mw.workbenchActivated.connect(onWorkbenchActivated)
             import ShortCuts_Gui
+            QtCore.QTimer.singleShot(0, onWarmUp)
 
-    def onPreStart():
-        """"""
-        if App.Version()[1] < "17":
-            onStart()
-        else:
-            if mw.property("eventLoop"):
-                onStart()
+    def onWarmUp():
+        """
+        Build the overlay on an idle tick after start.
+        """
+        build()
+
+    onEventLoop(onStart)
 
-    startTimer = delayTimer()
-    startTimer.timeout.connect(onPreStart)
-    startTimer.start(500)
+    return build
 
 
 shortCuts()
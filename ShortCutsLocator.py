@@ -27,3 +27,73 @@ def delayTimer():
     timer = QtCore.QTimer()
 
     return timer
+
+
+def onEventLoop(fn):
+    """
+    Call fn once the FreeCAD event loop is running.
+    Main window eventLoop dynamic property change is watched,
+    FreeCAD 0.16 has no such property and fn is called on the first tick.
+    """
+    from PySide import QtCore
+    import FreeCADGui as Gui
+    import FreeCAD as App
+
+    mw = Gui.getMainWindow()
+    callbacks.append(fn)
+
+    if len(callbacks) > 1:
+        return
+    else:
+        pass
+
+    def fire():
+        """
+        Call and forget registered callbacks.
+        """
+        mw.removeEventFilter(startFilter)
+
+        while callbacks:
+            callbacks.pop(0)()
+
+    def onTick():
+        """
+        Fire if the event loop is already running.
+        """
+        if App.Version()[1] < "17" or mw.property("eventLoop"):
+            fire()
+        else:
+            pass
+
+    class StartFilter(QtCore.QObject):
+        """
+        Fire on eventLoop dynamic property change.
+        """
+        def eventFilter(self, obj, e):
+            if (e.type() == QtCore.QEvent.DynamicPropertyChange and
+                    propertyName(e) == "eventLoop" and
+                    obj.property("eventLoop")):
+                QtCore.QTimer.singleShot(0, fire)
+            else:
+                pass
+
+            return False
+
+    startFilter = StartFilter(mw)
+    mw.installEventFilter(startFilter)
+    QtCore.QTimer.singleShot(0, onTick)
+
+
+def propertyName(e):
+    """
+    Return dynamic property change event property name as text.
+    """
+    name = e.propertyName()
+
+    try:
+        return name.data().decode("UTF-8")
+    except AttributeError:
+        return str(name)
+
+
+callbacks = []
@@ -0,0 +1,126 @@
+# ShortCuts overlay for FreeCAD
+# Copyright (C) 2016, 2017, 2018 triplus @ FreeCAD
+#
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+
+"""Key sequence conflict index for ShortCuts.
+
+Each scope (global shortcuts, a workbench, built-in defaults or the overlay)
+maps normalized key sequences to the set of commands bound to them. Scopes
+are updated one binding at a time, conflicts of a command are found by
+looking up its effective sequence in the scopes that apply to a workbench.
+Database scopes are reloaded after invalidate(), the overlay scope is owned
+by the overlay and kept.
+"""
+
+
+import ShortCuts_Database
+
+
+DEFAULT = "Default"
+GLOBAL = "GlobalShortcuts"
+OVERLAY = "Overlay"
+# Scope -> {sequence key: set of commands}
+index = {}
+# Scope -> {command: sequence}
+bindings = {}
+# Scope -> (source, database generation, staged writes) when it was loaded
+loaded = {}
+
+
+def key(sequence):
+    """Sequence as compared for conflicts."""
+    return sequence.strip().upper()
+
+
+def bind(scope, command, sequence):
+    """Set the command sequence in scope, empty sequence removes it."""
+    seqs = bindings.setdefault(scope, {})
+    idx = index.setdefault(scope, {})
+    old = seqs.pop(command, None)
+    if old:
+        k = key(old)
+        commands = idx.get(k)
+        if commands is not None:
+            commands.discard(command)
+            if not commands:
+                del idx[k]
+    if sequence:
+        seqs[command] = sequence
+        idx.setdefault(key(sequence), set()).add(command)
+
+
+def load(scope, data):
+    """Replace scope bindings with {command: sequence}."""
+    index[scope] = {}
+    bindings[scope] = {}
+    for command in data or {}:
+        bind(scope, command, data[command])
+
+
+def sync(source, workbench):
+    """Reload workbench and global scopes if the database changed."""
+    # Cached dictionaries are updated in place, compare versions instead
+    version = (source,
+               ShortCuts_Database.state["generation"],
+               len(ShortCuts_Database.journal))
+    for scope in (workbench, GLOBAL):
+        if loaded.get(scope) == version:
+            continue
+        merged = dict(ShortCuts_Database.load(source, scope) or {})
+        merged.update(ShortCuts_Database.staged.get((source, scope), {}))
+        load(scope, merged)
+        loaded[scope] = version
+
+
+def invalidate():
+    """Forget database scopes, defaults and overlay are kept."""
+    for scope in list(bindings):
+        if scope not in (DEFAULT, OVERLAY):
+            bindings.pop(scope, None)
+            index.pop(scope, None)
+    loaded.clear()
+
+
+def scopes(workbench):
+    """Scopes that apply to the workbench, highest priority first."""
+    if workbench == GLOBAL:
+        return (GLOBAL, DEFAULT)
+    return (workbench, GLOBAL, DEFAULT)
+
+
+def effective(workbench, command):
+    """Sequence the command is bound to in the workbench."""
+    for scope in scopes(workbench):
+        sequence = bindings.get(scope, {}).get(command)
+        if sequence:
+            return sequence
+    return ""
+
+
+def conflicts(workbench, command):
+    """Set of other commands bound to the same sequence in the workbench."""
+    sequence = effective(workbench, command)
+    found = set()
+    if not sequence:
+        return found
+    k = key(sequence)
+    for scope in scopes(workbench):
+        for c in index.get(scope, {}).get(k, ()):
+            if c != command and c not in found:
+                if key(effective(workbench, c)) == k:
+                    found.add(c)
+    return found
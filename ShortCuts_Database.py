@@ -0,0 +1,685 @@
+# ShortCuts overlay for FreeCAD
+# Copyright (C) 2016, 2017, 2018 triplus @ FreeCAD
+#
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+
+"""Shortcuts database for ShortCuts.
+
+Parsed {command: shortcut} dictionaries are cached per source and workbench.
+Writes go through to the parameter store, changes made by others are picked
+up by a parameter observer that invalidates the cache. Inside a transaction
+writes are staged in memory and flushed on commit, rollback discards only
+what its own transaction staged. The whole database can be exported to and
+imported from a single JSON or marshal file, imported shortcuts are
+normalized and invalid ones dropped.
+
+Sources are named profiles, "User" is the default one. The active profile
+is saved in the Profile parameter.
+"""
+
+
+import json
+import marshal
+from collections import OrderedDict
+import ShortCuts_Instrument
+import ShortCuts_KeySequence
+
+
+p = ShortCuts_Instrument.params("User parameter:BaseApp/ShortCutsDev")
+# (source, workbench) -> {command: shortcut} or None if group does not exist
+cache = {}
+# (source, workbench) -> {"index": [n], "numbers": {command: n},
+#                         "stale": {n: command}, "last": int}
+groups = {}
+# (source, workbench) -> [observed workbench group, {number: group}]
+attached = {}
+# Source -> observed source group
+sources = {}
+# (source, workbench) -> {command: shortcut} staged in a transaction
+staged = {}
+# (key, command, previous staged shortcut) per staged write, rollback()
+# undoes entries back to the mark its begin() pushed
+journal = []
+marks = []
+missing = object()
+# Start of binary export files, JSON is read otherwise
+binaryHeader = b"ShortCuts marshal\n"
+
+try:
+    strings = (str, unicode)
+except NameError:
+    strings = (str,)
+state = {"generation": 0,
+         "writing": 0,
+         "transaction": 0,
+         "cacheSize": max(1, p.GetInt("SchemeCacheSize", 8))}
+# Staged edits per workbench above which commit rewrites the whole group
+compactLimit = 16
+# (source, workbench) -> (generation, scheme, local, global), LRU order
+compiled = OrderedDict()
+
+
+class Observer(object):
+    """Invalidate the cache when the database is changed by others."""
+
+    def onChange(self, grp, reason):
+        """Parameter group changed."""
+        if not state["writing"]:
+            invalidate()
+
+
+class RootObserver(object):
+    """Invalidate the cache when profiles are added or removed by others."""
+
+    def onChange(self, grp, reason):
+        """Parameter or group of the database root changed."""
+        if state["writing"]:
+            return
+        # Settings like Profile are stored next to the profile groups
+        if p.HasGroup(reason):
+            attachSource(reason)
+            invalidate()
+        elif reason in sources:
+            del sources[reason]
+            invalidate()
+
+
+observer = Observer()
+rootObserver = RootObserver()
+
+
+def getString(g, name):
+    """Read string from the group."""
+    # Py2/Py3
+    try:
+        return g.GetString(name).decode("UTF-8")
+    except AttributeError:
+        return g.GetString(name)
+
+
+def setString(g, name, value):
+    """Write string to the group."""
+    # Py2/Py3
+    try:
+        g.SetString(name, value.encode("UTF-8"))
+    except TypeError:
+        g.SetString(name, value)
+
+
+state["profile"] = getString(p, "Profile") or "User"
+
+
+def attachSource(source):
+    """Observe the source group for workbench groups added or removed."""
+    if source not in sources and p.HasGroup(source):
+        g = p.GetGroup(source)
+        g.Attach(observer)
+        sources[source] = g
+
+
+def detachSource(source):
+    """Stop observing the source group."""
+    g = sources.pop(source, None)
+    if g is not None:
+        g.Detach(observer)
+
+
+p.Attach(rootObserver)
+for source in p.GetGroups():
+    attachSource(source)
+
+
+def hasGroup(source=None, workbench=None):
+    """Check database group existence without creating it."""
+    if not all([source, workbench]):
+        return False
+    if (source, workbench) in cache:
+        return cache[(source, workbench)] is not None
+    if not p.HasGroup(source):
+        return False
+    if not p.GetGroup(source).HasGroup(workbench):
+        return False
+    return True
+
+
+def splitIndex(source=None, workbench=None):
+    """Create and return an index list."""
+    index = []
+    if not hasGroup(source, workbench):
+        return index
+    index = p.GetGroup(source).GetGroup(workbench).GetString("index")
+    if index:
+        return index.split(",")
+    return []
+
+
+def attach(source, workbench):
+    """Observe existing workbench group and its numbered groups.
+
+    Changes of a numbered group are not reported to the workbench group.
+    """
+    key = (source, workbench)
+    attachSource(source)
+    if key not in attached and hasGroup(source, workbench):
+        base = p.GetGroup(source).GetGroup(workbench)
+        base.Attach(observer)
+        attached[key] = [base, {}]
+        if key in groups:
+            for n in groups[key]["index"]:
+                attachNumber(source, workbench, n, base.GetGroup(n))
+
+
+def attachNumber(source, workbench, n, g):
+    """Observe numbered group n of an observed workbench group."""
+    entry = attached.get((source, workbench))
+    if entry is not None and n not in entry[1]:
+        g.Attach(observer)
+        entry[1][n] = g
+
+
+def detachNumber(source, workbench, n):
+    """Stop observing numbered group n before it is removed."""
+    entry = attached.get((source, workbench))
+    if entry is not None:
+        g = entry[1].pop(n, None)
+        if g is not None:
+            g.Detach(observer)
+
+
+def detach(source, workbench):
+    """Stop observing the workbench group and its numbered groups."""
+    entry = attached.pop((source, workbench), None)
+    if entry is not None:
+        entry[0].Detach(observer)
+        for n in entry[1]:
+            entry[1][n].Detach(observer)
+
+
+def invalidate(source=None, workbench=None):
+    """Drop cached data, everything if no workbench is given."""
+    if source and workbench:
+        cache.pop((source, workbench), None)
+        groups.pop((source, workbench), None)
+    else:
+        cache.clear()
+        groups.clear()
+    state["generation"] += 1
+
+
+def lastNumber(index):
+    """Return the highest group number in use."""
+    n = 0
+    for i in index:
+        try:
+            n = max(n, int(i))
+        except ValueError:
+            pass
+    return n
+
+
+def load(source=None, workbench=None):
+    """Return cached {command: shortcut} dictionary or None."""
+    if not all([source, workbench]):
+        return None
+    key = (source, workbench)
+    if key in cache:
+        return cache[key]
+    if not hasGroup(source, workbench):
+        cache[key] = None
+        return None
+    data = {}
+    numbers = {}
+    stale = {}
+    index = splitIndex(source, workbench)
+    base = p.GetGroup(source).GetGroup(workbench)
+    for i in index:
+        g = base.GetGroup(i)
+        command = g.GetString("command")
+        shortcut = getString(g, "shortcut")
+        if command and shortcut:
+            if command in numbers:
+                stale[numbers[command]] = command
+            data[command] = shortcut
+            numbers[command] = i
+        else:
+            stale[i] = command
+    cache[key] = data
+    groups[key] = {"index": index,
+                   "numbers": numbers,
+                   "stale": stale,
+                   "last": lastNumber(index)}
+    attach(source, workbench)
+    return data
+
+
+def compact(source, workbench, data=None):
+    """Rewrite the workbench group from scratch and update the cache."""
+    if data is None:
+        data = dict(load(source, workbench) or {})
+    state["writing"] += 1
+    try:
+        detach(source, workbench)
+        if hasGroup(source, workbench):
+            p.GetGroup(source).RemGroup(workbench)
+        invalidate(source, workbench)
+        if data:
+            n = 1
+            index = []
+            numbers = {}
+            base = p.GetGroup(source).GetGroup(workbench)
+            for i in data:
+                index.append(str(n))
+                numbers[i] = str(n)
+                g = base.GetGroup(str(n))
+                g.SetString("command", i)
+                setString(g, "shortcut", data[i])
+                n += 1
+            base.SetString("index", ",".join(index))
+            cache[(source, workbench)] = dict(data)
+            groups[(source, workbench)] = {"index": index,
+                                           "numbers": numbers,
+                                           "stale": {},
+                                           "last": n - 1}
+            attach(source, workbench)
+        else:
+            cache[(source, workbench)] = None
+    finally:
+        state["writing"] -= 1
+
+
+def upsert(source, workbench, command, shortcut):
+    """Insert, update or delete (empty shortcut) a single command."""
+    data = load(source, workbench)
+    if not shortcut and not data:
+        return
+    if not shortcut and command not in data:
+        return
+    if data and data.get(command) == shortcut:
+        return
+    state["writing"] += 1
+    try:
+        if data is None:
+            data = cache[(source, workbench)] = {}
+            groups[(source, workbench)] = {"index": [],
+                                           "numbers": {},
+                                           "stale": {},
+                                           "last": 0}
+        meta = groups[(source, workbench)]
+        index = meta["index"]
+        base = p.GetGroup(source).GetGroup(workbench)
+        if shortcut:
+            if command in meta["numbers"]:
+                g = base.GetGroup(meta["numbers"][command])
+            else:
+                meta["last"] += 1
+                n = str(meta["last"])
+                meta["numbers"][command] = n
+                index.append(n)
+                g = base.GetGroup(n)
+                g.SetString("command", command)
+                base.SetString("index", ",".join(index))
+            setString(g, "shortcut", shortcut)
+            data[command] = shortcut
+            attach(source, workbench)
+            attachNumber(source, workbench, meta["numbers"][command], g)
+        else:
+            remove = [meta["numbers"].pop(command)]
+            for n in list(meta["stale"]):
+                if meta["stale"][n] == command:
+                    remove.append(n)
+                    del meta["stale"][n]
+            for n in remove:
+                detachNumber(source, workbench, n)
+                base.RemGroup(n)
+                if n in index:
+                    index.remove(n)
+            del data[command]
+            if data:
+                base.SetString("index", ",".join(index))
+            elif not meta["stale"]:
+                detach(source, workbench)
+                p.GetGroup(source).RemGroup(workbench)
+                cache[(source, workbench)] = None
+                groups.pop((source, workbench), None)
+            else:
+                base.SetString("index", ",".join(index))
+    finally:
+        state["writing"] -= 1
+    state["generation"] += 1
+
+
+def compileScheme(source, workbench):
+    """Return (scheme, local, global) with local shortcuts over global ones.
+
+    Compiled schemes are cached until the database generation changes. The
+    number of cached schemes is limited by the SchemeCacheSize parameter.
+    """
+    key = (source, workbench)
+    entry = compiled.pop(key, None)
+    if entry is None or entry[0] != state["generation"]:
+        with ShortCuts_Instrument.span("compileScheme",
+                                       source=source,
+                                       workbench=workbench) as s:
+            local = dict(load(source, workbench) or {})
+            glob = {}
+            if workbench != "GlobalShortcuts":
+                glob = dict(load(source, "GlobalShortcuts") or {})
+            scheme = dict(glob)
+            scheme.update(local)
+            entry = (state["generation"], scheme, local, glob)
+            s.args["commands"] = len(scheme)
+    compiled[key] = entry
+    while len(compiled) > state["cacheSize"]:
+        compiled.popitem(last=False)
+    return entry[1:]
+
+
+def setCacheSize(size):
+    """Set and save the maximum number of compiled schemes."""
+    state["cacheSize"] = max(1, int(size))
+    p.SetInt("SchemeCacheSize", state["cacheSize"])
+    while len(compiled) > state["cacheSize"]:
+        compiled.popitem(last=False)
+
+
+def get(source, workbench, command):
+    """Return shortcut of the command including staged changes."""
+    key = (source, workbench)
+    if key in staged and command in staged[key]:
+        return staged[key][command]
+    data = load(source, workbench)
+    if data:
+        return data.get(command, "")
+    return ""
+
+
+def database(source=None, workbench=None, commands=None):
+    """Upsert or delete (empty shortcut) commands, compact if none given."""
+    if not all([source, workbench]):
+        return
+    if commands and state["transaction"]:
+        key = (source, workbench)
+        data = staged.setdefault(key, {})
+        for cmd in commands:
+            journal.append((key, cmd, data.get(cmd, missing)))
+            data[cmd] = commands[cmd]
+    elif commands:
+        for cmd in commands:
+            upsert(source, workbench, cmd, commands[cmd])
+    else:
+        compact(source, workbench)
+
+
+def begin():
+    """Start staging database writes in memory."""
+    marks.append(len(journal))
+    state["transaction"] += 1
+
+
+def pending():
+    """True if there are staged changes."""
+    return bool(staged)
+
+
+def commit():
+    """End the transaction, flush staged changes if it was the outer one."""
+    if state["transaction"]:
+        state["transaction"] -= 1
+        marks.pop()
+    if state["transaction"]:
+        return False
+    del journal[:]
+    changed = bool(staged)
+    while staged:
+        (source, workbench), commands = staged.popitem()
+        if len(commands) > compactLimit:
+            data = dict(load(source, workbench) or {})
+            for cmd in commands:
+                if commands[cmd]:
+                    data[cmd] = commands[cmd]
+                else:
+                    data.pop(cmd, None)
+            compact(source, workbench, data)
+        else:
+            for cmd in commands:
+                upsert(source, workbench, cmd, commands[cmd])
+    return changed
+
+
+def rollback():
+    """Discard changes staged since the matching begin() and end it.
+
+    Changes of outer transactions stay staged.
+    """
+    if not state["transaction"]:
+        return
+    state["transaction"] -= 1
+    mark = marks.pop()
+    while len(journal) > mark:
+        key, cmd, old = journal.pop()
+        data = staged.get(key)
+        if data is None:
+            # Dropped with its profile
+            continue
+        if old is missing:
+            data.pop(cmd, None)
+            if not data:
+                del staged[key]
+        else:
+            data[cmd] = old
+
+
+class Transaction(object):
+    """Stage writes, commit on success and rollback on error."""
+
+    def __enter__(self):
+        begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is None:
+            commit()
+        else:
+            rollback()
+        return False
+
+
+def transaction():
+    """Context manager for batched database writes."""
+    return Transaction()
+
+
+def dump():
+    """Return the database as {source: {workbench: {command: shortcut}}}."""
+    data = {}
+    for source in p.GetGroups():
+        for workbench in p.GetGroup(source).GetGroups():
+            commands = load(source, workbench)
+            if commands:
+                data.setdefault(source, {})[workbench] = dict(commands)
+    return data
+
+
+def parse(data):
+    """Return a checked copy of dump() data with normalized shortcuts.
+
+    Raises ValueError if data is not {source: {workbench: {command:
+    shortcut}}} with string names and shortcuts. Empty and invalid shortcuts
+    are dropped.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Sources must be a dictionary")
+    result = {}
+    for source in data:
+        if (not isinstance(source, strings) or not source or
+                not isinstance(data[source], dict)):
+            raise ValueError("Invalid profile: %r" % (source,))
+        for workbench in data[source]:
+            commands = data[source][workbench]
+            if (not isinstance(workbench, strings) or not workbench or
+                    not isinstance(commands, dict)):
+                raise ValueError("Invalid workbench: %r" % (workbench,))
+            checked = {}
+            for cmd in commands:
+                shortcut = commands[cmd]
+                if (not isinstance(cmd, strings) or
+                        not isinstance(shortcut, strings)):
+                    raise ValueError("Invalid shortcut: %r" % (cmd,))
+                if cmd and shortcut:
+                    checked[cmd] = shortcut
+            # Stored as the shortcut editor would save it
+            checked = ShortCuts_KeySequence.validate(checked)[0]
+            result.setdefault(source, {})[workbench] = checked
+    return result
+
+
+def restore(data, replace=True):
+    """Write dump() data, one rewrite per changed workbench group.
+
+    Groups missing from data are removed if replace is True. Data is
+    checked with parse() before anything is written.
+    """
+    data = parse(data)
+    if replace:
+        for source in p.GetGroups():
+            for workbench in p.GetGroup(source).GetGroups():
+                if workbench not in data.get(source, {}):
+                    compact(source, workbench, {})
+    for source in data:
+        for workbench in data[source]:
+            commands = data[source][workbench]
+            if not replace:
+                merged = dict(load(source, workbench) or {})
+                merged.update(commands)
+                commands = merged
+            if (load(source, workbench) or {}) != commands:
+                compact(source, workbench, commands)
+
+
+def exportFile(path, binary=False):
+    """Write the database to a JSON or binary (marshal) file.
+
+    Binary files are faster to read but only portable between installations
+    with the same Python version. They start with binaryHeader.
+    """
+    data = {"format": "ShortCuts", "version": 1, "sources": dump()}
+    if binary:
+        with open(path, "wb") as f:
+            f.write(binaryHeader)
+            marshal.dump(data, f)
+    else:
+        with open(path, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+
+
+def importFile(path, replace=True):
+    """Read a file written by exportFile and restore it.
+
+    Only files with binaryHeader are read with marshal, which is not safe
+    for untrusted data. Import binary files from trusted sources only.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw.startswith(binaryHeader):
+        data = marshal.loads(raw[len(binaryHeader):])
+    else:
+        data = json.loads(raw.decode("UTF-8"))
+    if (not isinstance(data, dict) or
+            data.get("format") != "ShortCuts" or
+            "sources" not in data):
+        raise ValueError("Not a ShortCuts export file: " + path)
+    if data.get("version") != 1:
+        raise ValueError("Unsupported ShortCuts export version: %r" %
+                         (data.get("version"),))
+    restore(data["sources"], replace)
+
+
+def profiles():
+    """Names of saved profiles, the default User profile first."""
+    names = sorted([s for s in p.GetGroups() if s != "User"])
+    return ["User"] + names
+
+
+def activeProfile():
+    """Name of the active profile."""
+    return state["profile"]
+
+
+def setActiveProfile(name):
+    """Save the active profile name."""
+    if not name or "/" in name:
+        raise ValueError("Invalid profile name: " + repr(name))
+    state["profile"] = name
+    setString(p, "Profile", name)
+
+
+def workbenches(source):
+    """Workbench groups of the source."""
+    if not p.HasGroup(source):
+        return []
+    return p.GetGroup(source).GetGroups()
+
+
+def copyProfile(source, target, overwrite=False):
+    """Copy the source profile to target.
+
+    An existing target profile is replaced only if overwrite is True.
+    """
+    if not target or "/" in target:
+        raise ValueError("Invalid profile name: " + repr(target))
+    if source == target:
+        return
+    if target in profiles() and not overwrite:
+        raise ValueError("Profile already exists: " + target)
+    dropProfile(target)
+    for workbench in workbenches(source):
+        data = load(source, workbench)
+        if data:
+            compact(target, workbench, dict(data))
+
+
+def deleteProfile(name):
+    """Remove the profile, the default User profile can not be deleted."""
+    if name == "User":
+        raise ValueError("The default profile can not be deleted")
+    dropProfile(name)
+    if name == state["profile"]:
+        setActiveProfile("User")
+
+
+def dropProfile(name):
+    """Remove the profile groups and compiled schemes."""
+    for workbench in workbenches(name):
+        compact(name, workbench, {})
+        staged.pop((name, workbench), None)
+    detachSource(name)
+    if p.HasGroup(name):
+        state["writing"] += 1
+        try:
+            p.RemGroup(name)
+        finally:
+            state["writing"] -= 1
+    for key in list(compiled):
+        if key[0] == name:
+            del compiled[key]
+
+
+def precompile(workbench):
+    """Compile schemes of all profiles for the workbench."""
+    names = profiles()
+    state["cacheSize"] = max(state["cacheSize"], len(names) + 1)
+    for name in names:
+        compileScheme(name, workbench)
@@ -19,124 +19,139 @@
 """Shortcuts manager for FreeCAD"""
 
 
-import os
 from PySide import QtGui
 from PySide import QtCore
 import FreeCADGui as Gui
 import FreeCAD as App
+import ShortCutsLocator
+import ShortCuts_Registry
+import ShortCuts_Database
+import ShortCuts_Icons
+import ShortCuts_Model
+import ShortCuts_Conflicts
+import ShortCuts_Instrument
+import ShortCuts_KeySequence
 
 
 scheme = {}
-actions = {}
+actions = ShortCuts_Registry.commands
 defaults = {}
+bound = {}
 localUser = {}
 globalUser = {}
+current = {"workbench": None}
 mw = Gui.getMainWindow()
-verify = QtGui.QAction(mw)
-p = App.ParamGet("User parameter:BaseApp/ShortCutsDev")
-path = os.path.dirname(__file__) + "/Resources/icons/"
+p = ShortCuts_Database.p
+path = ShortCuts_Icons.path
 
 
 def wbIcon(i):
     """Create workbench icon."""
-    if str(i.find("XPM")) != "-1":
-        try:
-            icon = []
-            for a in ((((i
-                         .split('{', 1)[1])
-                        .rsplit('}', 1)[0])
-                       .strip())
-                      .split("\n")):
-                icon.append((a
-                             .split('"', 1)[1])
-                            .rsplit('"', 1)[0])
-            icon = QtGui.QIcon(QtGui.QPixmap(icon))
-        except:
-            icon = QtGui.QIcon(":/icons/freecad")
-    else:
-        icon = QtGui.QIcon(QtGui.QPixmap(i))
-    if icon.isNull():
-        icon = QtGui.QIcon(":/icons/freecad")
-    return icon
+    return ShortCuts_Icons.workbenchIcon(i, ShortCuts_Icons
+                                         .resource(":/icons/freecad"))
 
 
 def itemIcon(command):
     """Shortcut item icon indicator."""
-    if command in localUser and command in defaults and defaults[command]:
-        icon = QtGui.QIcon(path + os.sep + "ShortCuts_LocalGlobal.svg")
+    if command in localUser and defaultShortcut(command):
+        icon = ShortCuts_Icons.icon("ShortCuts_LocalGlobal")
     elif command in localUser and command in globalUser:
-        icon = QtGui.QIcon(path + os.sep + "ShortCuts_LocalGlobal.svg")
+        icon = ShortCuts_Icons.icon("ShortCuts_LocalGlobal")
     elif command in localUser:
-        icon = QtGui.QIcon(path + os.sep + "ShortCuts_Local.svg")
+        icon = ShortCuts_Icons.icon("ShortCuts_Local")
     else:
-        icon = QtGui.QIcon(path + os.sep + "ShortCuts_Global.svg")
+        icon = ShortCuts_Icons.icon("ShortCuts_Global")
     return icon
 
 
+@ShortCuts_Instrument.timed("ShortCuts_Gui.updateActions")
 def updateActions():
-    """Create and update a dictionary of unique actions."""
-    actions.clear()
-    duplicates = []
-    for i in mw.findChildren(QtGui.QAction):
-        name = i.objectName()
-        if name and i.text() and "," not in name:
-            if name in actions:
-                if name not in duplicates:
-                    duplicates.append(name)
-            else:
-                actions[name] = i
-    for d in duplicates:
-        del actions[d]
+    """Update the dictionary of unique actions from the registry."""
+    ShortCuts_Registry.update()
 
 
 def hasGroup(source=None, workbench=None):
     """Reduce creation of empty database groups."""
-    if not all([source, workbench]):
-        return False
-    if not p.HasGroup(source):
-        return False
-    if not p.GetGroup(source).HasGroup(workbench):
-        return False
-    return True
+    return ShortCuts_Database.hasGroup(source, workbench)
 
 
 def splitIndex(source=None, workbench=None):
     """Create and return an index list."""
-    index = []
-    if not all([source, workbench]):
-        return index
-    if not hasGroup(source, workbench):
-        return index
-    index = p.GetGroup(source).GetGroup(workbench).GetString("index")
-    if index:
-        index = index.split(",")
-    return index
+    return ShortCuts_Database.splitIndex(source, workbench)
+
+
+def defaultShortcut(command):
+    """Shortcut the command had before it was changed by ShortCuts."""
+    if command in defaults:
+        return defaults[command]
+    if command in actions and command not in bound:
+        return actions[command].shortcut().toString()
+    return ""
+
+
+def bindShortcut(command, shortcut):
+    """Save default and apply shortcut to the command action."""
+    action = actions[command]
+    if command not in defaults:
+        defaults[command] = action.shortcut().toString()
+    action.setShortcut(QtGui.QKeySequence(shortcut))
+    bound[command] = [action, shortcut]
+
+
+def restoreShortcut(command):
+    """Restore default shortcut of the bound command."""
+    action = bound.pop(command)[0]
+    try:
+        action.setShortcut(QtGui.QKeySequence(defaults.get(command, "")))
+    except RuntimeError:
+        # Action was deleted
+        pass
+
+
+def onRegistry(changed):
+    """Keep default shortcuts in the conflict index current."""
+    for command in changed:
+        if command in actions:
+            shortcut = defaultShortcut(command)
+        else:
+            shortcut = ""
+        ShortCuts_Conflicts.bind(ShortCuts_Conflicts.DEFAULT,
+                                 command,
+                                 shortcut)
 
 
 def resetShortcuts():
     """Reset shortcuts to defaults."""
-    for s in scheme:
-        if s in defaults and s in actions:
-            actions[s].setShortcut(QtGui.QKeySequence(defaults[s]))
-        elif s in actions:
-            actions[s].setShortcut(QtGui.QKeySequence(""))
-        else:
-            pass
+    for s in list(bound):
+        restoreShortcut(s)
 
 
+@ShortCuts_Instrument.timed("ShortCuts_Gui.applyShortcuts")
 def applyShortcuts():
     """Save defaults and apply shortcuts from scheme."""
-    for a in actions:
-        if a not in defaults:
-            defaults[a] = actions[a].shortcut().toString()
     for s in scheme:
         if s in actions:
-            actions[s].setShortcut(QtGui.QKeySequence(scheme[s]))
+            bindShortcut(s, scheme[s])
+
+
+def applyDelta():
+    """Apply only shortcuts that differ from the currently bound ones."""
+    for s in list(bound):
+        if s not in scheme:
+            restoreShortcut(s)
+    for s in scheme:
+        action = actions.get(s)
+        if action is None:
+            bound.pop(s, None)
+            continue
+        b = bound.get(s)
+        if b is None or b[0] is not action or b[1] != scheme[s]:
+            bindShortcut(s, scheme[s])
 
 
 def printShortcuts():
     """Print active shortcuts to the report view"""
-    for a in mw.findChildren(QtGui.QAction):
+    for a in ShortCuts_Registry.allActions():
         if a.shortcut().toString():
             if a.text():
                 text = a.text()
@@ -150,44 +165,73 @@ def printShortcuts():
 
 def updateDict(source, wb, d):
     """Update dictionary."""
-    if not hasGroup(source, wb):
+    data = ShortCuts_Database.load(source, wb)
+    if data is None:
         return False
-    index = splitIndex(source, wb)
-    base = p.GetGroup(source).GetGroup(wb)
-    for i in index:
-        g = base.GetGroup(i)
-        command = g.GetString("command")
-        # Py2/Py3
-        try:
-            shortcut = g.GetString("shortcut").decode("UTF-8")
-        except AttributeError:
-            shortcut = g.GetString("shortcut")
-        if command and shortcut:
-            d[command] = shortcut
-            if command not in scheme:
-                scheme[command] = shortcut
+    for command in data:
+        d[command] = data[command]
+        if command not in scheme:
+            scheme[command] = data[command]
     return True
 
 
+@ShortCuts_Instrument.timed("ShortCuts_Gui.update")
 def update(workbench):
     """Update shortcuts and apply them."""
     updateActions()
-    resetShortcuts()
+    current["workbench"] = workbench
+    source = ShortCuts_Database.activeProfile()
+    ShortCuts_Conflicts.sync(source, workbench)
 
+    compiled = ShortCuts_Database.compileScheme(source, workbench)
     scheme.clear()
+    scheme.update(compiled[0])
     localUser.clear()
-    updateDict("User", workbench, localUser)
+    localUser.update(compiled[1])
     globalUser.clear()
-    if workbench != "GlobalShortcuts":
-        updateDict("User", "GlobalShortcuts", globalUser)
+    globalUser.update(compiled[2])
 
-    applyShortcuts()
+    with ShortCuts_Instrument.span("rebind", workbench=workbench) as s:
+        if p.GetBool("FullRebind"):
+            resetShortcuts()
+            applyShortcuts()
+        else:
+            applyDelta()
+        s.args["scheme"] = len(scheme)
+        s.args["bound"] = len(bound)
 
 
+@ShortCuts_Instrument.timed("ShortCuts_Gui.onWorkbench")
 def onWorkbench():
     """Update shortcuts on workbench activated."""
     workbench = Gui.activeWorkbench().__class__.__name__
-    update(workbench)
+    with ShortCuts_Instrument.span("workbench", workbench=workbench):
+        update(workbench)
+    # Other profiles are compiled on idle for instant switching
+    QtCore.QTimer.singleShot(0, onPrecompile)
+
+
+def onPrecompile():
+    """Compile schemes of all profiles for the active workbench."""
+    ShortCuts_Database.precompile(Gui.activeWorkbench().__class__.__name__)
+
+
+def activateProfile(name):
+    """Activate the profile, only differing shortcuts are re-bound."""
+    with ShortCuts_Instrument.span("profile", profile=name):
+        ShortCuts_Database.setActiveProfile(name)
+        onWorkbench()
+
+
+def exportShortcuts(path, binary=False):
+    """Export the shortcuts database to a JSON or binary file."""
+    ShortCuts_Database.exportFile(path, binary)
+
+
+def importShortcuts(path):
+    """Replace the shortcuts database from a file and apply it."""
+    ShortCuts_Database.importFile(path)
+    onWorkbench()
 
 
 def comboBox():
@@ -201,16 +245,16 @@ def comboBox():
 
     for i in listWBSorted:
         try:
-            icon = wbIcon(Gui.listWorkbenches()[i].Icon)
+            icon = wbIcon(listWB[i].Icon)
         except AttributeError:
-            icon = QtGui.QIcon(":/icons/freecad")
+            icon = ShortCuts_Icons.resource(":/icons/freecad")
         cBox.insertItem(0,
                         icon,
                         listWB[i].MenuText,
                         listWB[i].__class__.__name__)
 
     cBox.insertSeparator(0)
-    icon = QtGui.QIcon(":/icons/freecad")
+    icon = ShortCuts_Icons.resource(":/icons/freecad")
     cBox.insertItem(0, icon, "Global shortcuts", "GlobalShortcuts")
     cBox.setCurrentIndex(0)
 
@@ -222,122 +266,88 @@ def comboBox():
 
 
 def searchLine(table):
-    """Search line for preferences."""
+    """Search line for preferences, filtering is delayed while typing."""
     search = QtGui.QLineEdit()
+    search.setPlaceholderText("Search")
 
-    def onSearch(text):
-        """Show or hide commands on search."""
-        for n in range(table.rowCount()):
-            t = table.item(n, 0).text()
-            if t and text and text.lower() in t.lower():
-                table.setRowHidden(n, False)
-            elif text:
-                table.setRowHidden(n, True)
-            else:
-                table.setRowHidden(n, False)
+    def onSearch():
+        """Show only matching commands."""
+        table.model().setSearch(search.text())
+
+    searchTimer = QtCore.QTimer(search)
+    searchTimer.setSingleShot(True)
+    searchTimer.setInterval(p.GetInt("SearchDelay", 150))
+    searchTimer.timeout.connect(onSearch)
+
+    def onTextEdited(text=None):
+        """Restart the search delay."""
+        searchTimer.start()
 
-    search.textEdited.connect(onSearch)
+    search.textEdited.connect(onTextEdited)
     return search
 
 
-def tableWidget():
-    """Table for commands and shortcuts."""
-    table = QtGui.QTableWidget(0, 2)
-    table.verticalHeader().setVisible(False)
-    table.setHorizontalHeaderLabels(["Command", "Shortcut"])
-    # Qt4/Qt5
-    try:
-        table.horizontalHeader().setResizeMode(QtGui.QHeaderView.Stretch)
-    except AttributeError:
-        table.horizontalHeader().setSectionResizeMode(QtGui.
-                                                      QHeaderView.
-                                                      Stretch)
+def shortcutText(command):
+    """Shortcut displayed for the command."""
+    if command in scheme and scheme[command]:
+        return scheme[command]
+    return defaultShortcut(command)
+
+
+def conflicts(command):
+    """Commands sharing the shortcut in the displayed workbench."""
+    return ShortCuts_Conflicts.conflicts(current["workbench"], command)
+
+
+def shortcutTip(command):
+    """List conflicting commands."""
+    found = conflicts(command)
+    if not found:
+        return None
+    names = []
+    for c in sorted(found):
+        if c in actions:
+            names.append(actions[c].text().replace("&", ""))
+        else:
+            names.append(c)
+    return "Conflicts with: " + ", ".join(names)
+
+
+def shortcutIcon(command):
+    """Shortcut indicator displayed for the command."""
+    if shortcutText(command):
+        return itemIcon(command)
+    return None
+
+
+def tableWidget(edit):
+    """Table for commands and shortcuts, edit(command, shortcut) saves."""
+    model = ShortCuts_Model.TableModel(shortcutText,
+                                       shortcutIcon,
+                                       shortcutTip,
+                                       edit,
+                                       ShortCuts_Icons
+                                       .resource(":/icons/freecad"),
+                                       conflict=conflicts)
+    table = ShortCuts_Model.tableView(model)
+    model.setParent(table)
     return table
 
 
+@ShortCuts_Instrument.timed("ShortCuts_Gui.updateTable")
 def updateTable(cBox, table):
-    """Update table widget items."""
+    """Update table model, cell data is fetched lazily by the view."""
     workbench = cBox.itemData(cBox.currentIndex())
-    update(workbench)
-    names = []
-    for i in actions:
-        text = actions[i].text()
-        text = text.replace("&", "")
-        names.append([text, actions[i].objectName()])
-    names = sorted(names)
-    sort = []
-    for i in names:
-        sort.append(i[1])
-    table.blockSignals(True)
-    table.clearContents()
-    table.setRowCount(len(actions))
-    row = 0
-    for i in sort:
-        command = QtGui.QTableWidgetItem()
-        text = actions[i].text()
-        text = text.replace("&", "")
-        command.setText(text)
-        command.setToolTip(actions[i].toolTip())
-        command.setFlags(QtCore.Qt.ItemIsEnabled)
-        if actions[i].icon():
-            command.setIcon(actions[i].icon())
-        else:
-            command.setIcon(QtGui.QIcon(":/icons/freecad"))
-        shortcut = QtGui.QTableWidgetItem()
-        text = actions[i].shortcut().toString()
-        if text:
-            shortcut.setText(text)
-            shortcut.setIcon(QtGui.QIcon(itemIcon(i)))
-        shortcut.setData(32, i)
-        table.setItem(row, 0, command)
-        table.setItem(row, 1, shortcut)
-        row += 1
-    table.blockSignals(False)
+    with ShortCuts_Instrument.span("preferences", workbench=workbench) as s:
+        update(workbench)
+        table.model().setCommands(ShortCuts_Registry.sortedCommands())
+        s.args["rows"] = table.model().rowCount()
 
 
+@ShortCuts_Instrument.timed("ShortCuts_Gui.database")
 def database(source=None, workbench=None, commands=None):
     """Manage shortcuts database access."""
-    current = {}
-    index = splitIndex(source, workbench)
-    if index:
-        base = p.GetGroup(source).GetGroup(workbench)
-        for i in index:
-            command = base.GetGroup(i).GetString("command")
-            # Py2/Py3
-            try:
-                shortcut = (base
-                            .GetGroup(i)
-                            .GetString("shortcut")
-                            .decode("UTF-8"))
-            except AttributeError:
-                shortcut = base.GetGroup(i).GetString("shortcut")
-            if command and shortcut:
-                current[command] = shortcut
-        p.GetGroup(source).RemGroup(workbench)
-    if commands:
-        for cmd in commands:
-            if commands[cmd]:
-                current[cmd] = commands[cmd]
-            elif cmd in current:
-                del current[cmd]
-            else:
-                pass
-    n = 1
-    index = []
-    base = p.GetGroup(source).GetGroup(workbench)
-    for i in current:
-        index.append(str(n))
-        g = base.GetGroup(str(n))
-        g.SetString("command", i)
-        # Py2/Py3
-        try:
-            g.SetString("shortcut", current[i].encode("UTF-8"))
-        except TypeError:
-            g.SetString("shortcut", current[i])
-        n += 1
-    base.SetString("index", ",".join(index))
-    if not splitIndex(source, workbench):
-        p.GetGroup(source).RemGroup(workbench)
+    ShortCuts_Database.database(source, workbench, commands)
 
 
 def preferences():
@@ -346,11 +356,46 @@ def preferences():
         """Close dialog on button close."""
         dia.done(1)
 
-    def onFinished():
-        """Delete dialog on close."""
+    def onFinished(result=1):
+        """Commit on close, revert edits on cancel and delete dialog."""
+        commitTimer.stop()
+        if result:
+            ShortCuts_Database.commit()
+        else:
+            ShortCuts_Database.rollback()
+            revert()
+            ShortCuts_Conflicts.invalidate()
         dia.deleteLater()
         onWorkbench()
 
+    def revert():
+        """Restore shortcuts edited in the dialog, one pass per workbench."""
+        edits = {}
+        for key in original:
+            source, workbench, command = key
+            edits.setdefault((source, workbench), {})[command] = original[key]
+        with ShortCuts_Database.transaction():
+            for source, workbench in edits:
+                database(source, workbench, edits[(source, workbench)])
+        original.clear()
+
+    def onCommit():
+        """Flush staged changes and apply them."""
+        commitTimer.stop()
+        if ShortCuts_Database.commit():
+            update(cBox.itemData(cBox.currentIndex()))
+        ShortCuts_Database.begin()
+
+    # Staged changes are committed after a period of inactivity
+    commitTimer = QtCore.QTimer()
+    commitTimer.setSingleShot(True)
+    commitTimer.setInterval(p.GetInt("CommitDelay", 500))
+    commitTimer.timeout.connect(onCommit)
+    ShortCuts_Database.begin()
+    # (source, workbench, command) -> shortcut before the dialog, edits
+    # are committed while it is open and restored from here on cancel
+    original = {}
+
     # Dialog
     dia = QtGui.QDialog(mw)
     dia.setModal(True)
@@ -370,50 +415,80 @@ def preferences():
     btnPrint.setToolTip("Print active shortcuts to the report view")
     btnPrint.clicked.connect(printShortcuts)
 
+    # Buttons export and import
+    btnExport = QtGui.QPushButton("Export")
+    btnExport.setToolTip("Export shortcuts of all workbenches to a file")
+    btnImport = QtGui.QPushButton("Import")
+    btnImport.setToolTip("Replace shortcuts with the ones from a file")
+
     loBtn = QtGui.QHBoxLayout()
     loBtn.addWidget(btnPrint)
+    loBtn.addWidget(btnExport)
+    loBtn.addWidget(btnImport)
     loBtn.addStretch()
     loBtn.addWidget(btnClose)
 
     # Combo
     cBox = comboBox()
 
-    # Table widget
-    table = tableWidget()
+    # Profiles
+    pBox = QtGui.QComboBox()
+    pBox.setToolTip("Active shortcuts profile")
 
-    # Search
-    search = searchLine(table)
+    btnProfile = QtGui.QPushButton("Save as")
+    btnProfile.setToolTip("Save a copy of the active profile")
+
+    btnDelete = QtGui.QPushButton("Delete")
+    btnDelete.setToolTip("Delete the active profile")
+
+    def updateProfiles():
+        """Fill profile combo box."""
+        pBox.blockSignals(True)
+        pBox.clear()
+        pBox.addItems(ShortCuts_Database.profiles())
+        pBox.setCurrentIndex(pBox.findText(ShortCuts_Database
+                                           .activeProfile()))
+        pBox.blockSignals(False)
+        btnDelete.setEnabled(ShortCuts_Database.activeProfile() != "User")
 
     # Functions and connections
-    def onItemChanged(item):
+    def onEdit(command, shortcut):
         """Save shortcut."""
         workbench = cBox.itemData(cBox.currentIndex())
-        command = item.data(32)
-        shortcut = item.text()
-        verify.setShortcut(QtGui.QKeySequence(shortcut))
-        shortcut = verify.shortcut().toString()
-        verify.setShortcut(QtGui.QKeySequence(""))
-        database("User", workbench, commands={command: shortcut})
-        update(workbench)
-        table.blockSignals(True)
+        shortcut = ShortCuts_KeySequence.normalize(shortcut)
+        source = ShortCuts_Database.activeProfile()
+        if (source, workbench, command) not in original:
+            original[(source, workbench, command)] = ShortCuts_Database.get(
+                source, workbench, command)
+        database(source, workbench, commands={command: shortcut})
+        commitTimer.start()
+        before = conflicts(command)
+        ShortCuts_Conflicts.bind(workbench, command, shortcut)
         if shortcut:
-            item.setText(shortcut)
-            item.setIcon(itemIcon(command))
-        elif command in scheme and scheme[command]:
-            item.setText(scheme[command])
-            item.setIcon(itemIcon(command))
-        elif command in defaults and defaults[command]:
-            item.setText(defaults[command])
-            item.setIcon(itemIcon(command))
+            localUser[command] = shortcut
+            scheme[command] = shortcut
         else:
-            item.setText("")
-            item.setIcon(QtGui.QIcon())
-        table.blockSignals(False)
+            localUser.pop(command, None)
+            if command in globalUser:
+                scheme[command] = globalUser[command]
+            else:
+                scheme.pop(command, None)
+        # Rows that gained or lost a conflict
+        for c in before | conflicts(command):
+            table.model().refresh(c)
+
+    # Table
+    table = tableWidget(onEdit)
 
-    table.itemChanged.connect(onItemChanged)
+    # Search
+    search = searchLine(table)
 
     def onCurrentIndexChanged():
         """Activate workbench on selection."""
+        if ShortCuts_Database.pending():
+            commitTimer.stop()
+            ShortCuts_Database.commit()
+            ShortCuts_Database.begin()
         workbench = cBox.itemData(cBox.currentIndex())
         wbList = Gui.listWorkbenches()
         for i in wbList:
@@ -423,12 +498,110 @@ def preferences():
 
     cBox.currentIndexChanged.connect(onCurrentIndexChanged)
 
+    def onProfile():
+        """Activate the selected profile."""
+        onCommit()
+        activateProfile(pBox.currentText())
+        updateProfiles()
+        updateTable(cBox, table)
+
+    def onSaveProfile():
+        """Copy the active profile to a new name and activate it."""
+        onCommit()
+        name, ok = QtGui.QInputDialog.getText(dia,
+                                              "Save profile",
+                                              "Profile name:")
+        if not ok or not name:
+            return
+        overwrite = name in ShortCuts_Database.profiles()
+        if overwrite:
+            answer = QtGui.QMessageBox.question(
+                dia,
+                "Save profile",
+                "Replace the existing profile " + name + "?",
+                QtGui.QMessageBox.Yes | QtGui.QMessageBox.No,
+                QtGui.QMessageBox.No)
+            if answer != QtGui.QMessageBox.Yes:
+                return
+        try:
+            ShortCuts_Database.copyProfile(ShortCuts_Database
+                                           .activeProfile(),
+                                           name,
+                                           overwrite)
+        except ValueError as e:
+            App.Console.PrintError("ShortCuts: " + str(e) + "\n")
+            return
+        activateProfile(name)
+        updateProfiles()
+        updateTable(cBox, table)
+
+    def onDeleteProfile():
+        """Delete the active profile and activate the default one."""
+        onCommit()
+        name = ShortCuts_Database.activeProfile()
+        try:
+            ShortCuts_Database.deleteProfile(name)
+        except ValueError as e:
+            App.Console.PrintError("ShortCuts: " + str(e) + "\n")
+            return
+        # Cancel must not recreate the deleted profile
+        for key in list(original):
+            if key[0] == name:
+                del original[key]
+        activateProfile("User")
+        updateProfiles()
+        updateTable(cBox, table)
+
+    updateProfiles()
+    pBox.currentIndexChanged.connect(onProfile)
+    btnProfile.clicked.connect(onSaveProfile)
+    btnDelete.clicked.connect(onDeleteProfile)
+
+    fileFilter = "JSON (*.json);;Binary (*.bin)"
+
+    def onExport():
+        """Commit staged changes and export the database."""
+        onCommit()
+        path, selected = QtGui.QFileDialog.getSaveFileName(dia,
+                                                           "Export shortcuts",
+                                                           "",
+                                                           fileFilter)
+        if path:
+            exportShortcuts(path, path.endswith(".bin") or
+                            selected.startswith("Binary"))
+
+    def onImport():
+        """Commit staged changes, import the database and refresh."""
+        onCommit()
+        path = QtGui.QFileDialog.getOpenFileName(dia,
+                                                 "Import shortcuts",
+                                                 "",
+                                                 fileFilter)[0]
+        if not path:
+            return
+        try:
+            importShortcuts(path)
+        except (IOError, OSError, ValueError, EOFError, TypeError) as e:
+            App.Console.PrintError("ShortCuts: import failed: " +
+                                   str(e) + "\n")
+        else:
+            # The imported database is kept on cancel
+            original.clear()
+        updateProfiles()
+        updateTable(cBox, table)
+
+    btnExport.clicked.connect(onExport)
+    btnImport.clicked.connect(onImport)
+
     updateTable(cBox, table)
 
     # Layout
     loTop = QtGui.QHBoxLayout()
     loTop.addWidget(cBox)
     loTop.addWidget(search)
+    loTop.addWidget(pBox)
+    loTop.addWidget(btnProfile)
+    loTop.addWidget(btnDelete)
 
     layout.insertLayout(0, loTop)
     layout.addWidget(table)
@@ -487,22 +660,13 @@ def onStart():
         pass
 
     if start:
-        timer.stop()
-        timer.deleteLater()
         onWorkbench()
         accessoriesMenu()
         mw.workbenchActivated.connect(onWorkbench)
 
 
-def onPreStart():
-    """Improve start reliability and maintain FreeCAD 0.16 support."""
-    if App.Version()[1] < "17":
-        onStart()
-    else:
-        if mw.property("eventLoop"):
-            onStart()
-
+ShortCuts_Registry.connect(onRegistry)
+if ShortCuts_Registry.state["started"]:
+    onRegistry(set(actions))
 
-timer = QtCore.QTimer()
-timer.timeout.connect(onPreStart)
-timer.start(500)
+ShortCutsLocator.onEventLoop(onStart)
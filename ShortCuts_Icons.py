@@ -0,0 +1,164 @@
+# ShortCuts overlay for FreeCAD
+# Copyright (C) 2016, 2017, 2018 triplus @ FreeCAD
+#
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+
+"""Shared icon cache for ShortCuts.
+
+Icons are created once per process and shared between the overlay and the
+shortcuts manager. QIcon is implicitly shared, returning the cached instance
+is cheap. Workbench icons are also stored as PNG files in the cache
+directory, so the XPM data is parsed only once across sessions.
+"""
+
+
+import os
+import hashlib
+from PySide import QtGui
+import FreeCAD as App
+
+
+path = os.path.dirname(__file__) + "/Resources/icons/"
+icons = {}
+stats = {"hits": 0, "misses": 0, "disk": 0}
+
+
+def cached(key, factory):
+    """Return cached icon or create it with factory."""
+    if key in icons:
+        stats["hits"] += 1
+    else:
+        stats["misses"] += 1
+        icons[key] = factory()
+    return icons[key]
+
+
+def icon(name):
+    """Icon from the Resources/icons folder, name without extension."""
+    return cached(("file", name),
+                  lambda: QtGui.QIcon(path + name + ".svg"))
+
+
+def resource(name):
+    """Icon from the Qt resource system."""
+    return cached(("resource", name),
+                  lambda: QtGui.QIcon(name))
+
+
+def svgIcon(name, svg):
+    """Icon rendered from SVG source."""
+    def factory():
+        """Render SVG data."""
+        pixmap = QtGui.QPixmap()
+        pixmap.loadFromData(str.encode(svg))
+        return QtGui.QIcon(pixmap)
+
+    return cached(("svg", name), factory)
+
+
+def cacheDir():
+    """Directory for rendered workbench icons."""
+    try:
+        base = App.getUserCachePath()
+    except AttributeError:
+        base = App.getUserAppDataDir()
+    return os.path.join(base, "ShortCuts", "icons")
+
+
+def xpmParse(i):
+    """Parse and prepare workbench icon in XPM format."""
+    icon = []
+    for a in ((((i
+                 .split('{', 1)[1])
+                .rsplit('}', 1)[0])
+               .strip())
+              .split("\n")):
+        icon.append((a
+                     .split('"', 1)[1])
+                    .rsplit('"', 1)[0])
+    return icon
+
+
+def sourceKey(i):
+    """Hash of the icon source data."""
+    data = i
+    if "XPM" not in i and os.path.isfile(i):
+        data = i + str(os.path.getmtime(i))
+    # Py2/Py3
+    try:
+        data = data.encode("UTF-8")
+    except (UnicodeDecodeError, AttributeError):
+        pass
+    return hashlib.sha1(data).hexdigest()
+
+
+def renderWorkbench(i):
+    """Render workbench icon source to a pixmap."""
+    try:
+        if "XPM" in i:
+            return QtGui.QPixmap(xpmParse(i))
+        return QtGui.QPixmap(i)
+    except Exception:
+        return QtGui.QPixmap()
+
+
+def workbenchIcon(i, fallback=None):
+    """Workbench icon from XPM data or file path.
+
+    Icons are memoized in memory by source and persisted as PNG files named
+    by a hash of the source. Fallback is returned for empty or invalid icons.
+    """
+    if not i:
+        return fallback
+    key = ("workbench", i)
+    if key in icons:
+        stats["hits"] += 1
+        return icons[key] or fallback
+    stats["misses"] += 1
+    png = os.path.join(cacheDir(), sourceKey(i) + ".png")
+    pixmap = QtGui.QPixmap()
+    if os.path.isfile(png) and pixmap.load(png):
+        stats["disk"] += 1
+    else:
+        pixmap = renderWorkbench(i)
+        if not pixmap.isNull():
+            try:
+                if not os.path.isdir(cacheDir()):
+                    os.makedirs(cacheDir())
+                pixmap.save(png, "PNG")
+            except (IOError, OSError):
+                pass
+    if pixmap.isNull():
+        icons[key] = None
+    else:
+        icons[key] = QtGui.QIcon(pixmap)
+    return icons[key] or fallback
+
+
+def statistics():
+    """Return cache size and hit, miss and disk hit counts."""
+    return {"icons": len(icons),
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "disk": stats["disk"]}
+
+
+def clear():
+    """Drop cached icons and reset counts."""
+    icons.clear()
+    stats["hits"] = 0
+    stats["misses"] = 0
+    stats["disk"] = 0
@@ -0,0 +1,241 @@
+# ShortCuts overlay for FreeCAD
+# Copyright (C) 2016, 2017, 2018 triplus @ FreeCAD
+#
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+
+"""Opt-in instrumentation for ShortCuts.
+
+Hot paths are wrapped with timed(), parameter groups with params(). While
+disabled both only check a flag. Enable from the Python console:
+
+    import ShortCuts_Instrument
+    ShortCuts_Instrument.enable()
+    ShortCuts_Instrument.report()
+    ShortCuts_Instrument.reset()
+
+Tracing records span() blocks as Chrome trace events in a ring buffer,
+saveTrace() writes them to a file for chrome://tracing or Perfetto:
+
+    ShortCuts_Instrument.startTrace()
+    ShortCuts_Instrument.saveTrace("/tmp/shortcuts.json")
+
+The Instrument and Trace parameters of BaseApp/ShortCutsDev enable them on
+start, TraceSize sets the number of kept events.
+"""
+
+
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+import FreeCAD as App
+
+
+clock = getattr(time, "perf_counter", time.time)
+p = App.ParamGet("User parameter:BaseApp/ShortCutsDev")
+state = {"enabled": p.GetBool("Instrument", False),
+         "tracing": p.GetBool("Trace", False)}
+# Complete ("X") trace events, oldest are dropped when full
+events = deque(maxlen=max(1, p.GetInt("TraceSize", 10000)))
+# Name -> [calls, total seconds, max seconds]
+timings = {}
+counters = {"reads": 0, "writes": 0}
+
+
+def record(name, elapsed):
+    """Add a call of the wall time elapsed."""
+    t = timings.get(name)
+    if t is None:
+        t = timings[name] = [0, 0.0, 0.0]
+    t[0] += 1
+    t[1] += elapsed
+    if elapsed > t[2]:
+        t[2] = elapsed
+
+
+def timed(name):
+    """Decorator recording calls and wall time of fn under name."""
+    def decorator(fn):
+        """Wrap fn."""
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            """Time the call if enabled."""
+            if not state["enabled"]:
+                return fn(*args, **kwargs)
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, clock() - start)
+        return call
+    return decorator
+
+
+class ParamGroup(object):
+    """Parameter group counting reads and writes while enabled.
+
+    While disabled GetGroup() returns plain groups, only calls made on this
+    group pass the proxy. Subgroups fetched then are not counted later.
+    """
+
+    def __init__(self, group):
+        self.group = group
+
+    def __getattr__(self, name):
+        attr = getattr(self.group, name)
+        if not state["enabled"]:
+            return attr
+        if name == "GetGroup":
+            return lambda n: ParamGroup(attr(n))
+        if name.startswith("Get") or name.startswith("Has"):
+            kind = "reads"
+        elif name.startswith("Set") or name.startswith("Rem"):
+            kind = "writes"
+        else:
+            return attr
+
+        def call(*args):
+            """Count and forward."""
+            counters[kind] += 1
+            return attr(*args)
+
+        return call
+
+
+def params(path):
+    """Counting parameter group for the path."""
+    return ParamGroup(App.ParamGet(path))
+
+
+def enable():
+    """Start recording."""
+    state["enabled"] = True
+
+
+def disable():
+    """Stop recording, collected data is kept."""
+    state["enabled"] = False
+
+
+def enabled():
+    """True if recording."""
+    return state["enabled"]
+
+
+def reset():
+    """Drop collected data."""
+    timings.clear()
+    counters["reads"] = 0
+    counters["writes"] = 0
+
+
+class Span(object):
+    """Trace event for a block, args can be added inside the block."""
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = clock()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        end = clock()
+        events.append({"name": self.name,
+                       "cat": self.category,
+                       "ph": "X",
+                       "ts": self.start * 1000000.0,
+                       "dur": (end - self.start) * 1000000.0,
+                       "pid": os.getpid(),
+                       "tid": threading.current_thread().ident,
+                       "args": self.args})
+        return False
+
+
+class IdleSpan(object):
+    """Span used while not tracing, records nothing."""
+
+    def __init__(self):
+        self.args = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.args.clear()
+        return False
+
+
+idle = IdleSpan()
+
+
+def span(name, category="ShortCuts", **args):
+    """Context manager recording the block as a trace event."""
+    if not state["tracing"]:
+        return idle
+    return Span(name, category, args)
+
+
+def startTrace(size=None):
+    """Start tracing, optionally with a new buffer size."""
+    global events
+    if size:
+        events = deque(events, maxlen=max(1, int(size)))
+    state["tracing"] = True
+
+
+def stopTrace():
+    """Stop tracing, recorded events are kept."""
+    state["tracing"] = False
+
+
+def clearTrace():
+    """Drop recorded events."""
+    events.clear()
+
+
+def trace():
+    """Recorded events in Chrome trace-event format."""
+    return {"traceEvents": list(events),
+            "displayTimeUnit": "ms"}
+
+
+def saveTrace(path=None):
+    """Write recorded events to path and return it."""
+    if not path:
+        path = os.path.join(App.getUserAppDataDir(), "ShortCuts_trace.json")
+    with open(path, "w") as f:
+        json.dump(trace(), f)
+    return path
+
+
+def report():
+    """Return collected data, times in milliseconds."""
+    functions = {}
+    for name in timings:
+        calls, total, most = timings[name]
+        functions[name] = {"calls": calls,
+                           "total": total * 1000.0,
+                           "mean": total * 1000.0 / calls,
+                           "max": most * 1000.0}
+    return {"enabled": state["enabled"],
+            "functions": functions,
+            "params": dict(counters)}
@@ -0,0 +1,218 @@
+# ShortCuts overlay for FreeCAD
+# Copyright (C) 2016, 2017, 2018 triplus @ FreeCAD
+#
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+
+"""Key sequence normalizer for ShortCuts.
+
+Pure Python version of QKeySequence(text).toString(), portable text format.
+Modifiers are ordered Meta, Ctrl, Alt, Shift, Num, key name aliases are
+replaced with canonical names and up to four chords are kept. Unknown chords
+become empty strings, as in Qt. Results are memoized, no Qt objects are
+created, so it also works for bulk imports and outside the GUI thread.
+"""
+
+
+import re
+
+
+# Canonical key names, F1 to F35 and single characters are handled apart
+keyNames = [
+            "Space", "Esc", "Tab", "Backtab", "Backspace", "Return", "Enter",
+            "Ins", "Del", "Pause", "Print", "SysReq", "Clear", "Home", "End",
+            "Left", "Up", "Right", "Down", "PgUp", "PgDown", "Shift",
+            "Control", "Meta", "Alt", "CapsLock", "NumLock", "ScrollLock",
+            "Menu", "Help", "Code input", "Multiple Candidate",
+            "Previous Candidate", "Kanji", "Muhenkan", "Henkan", "Romaji",
+            "Hiragana", "Katakana", "Hiragana Katakana", "Zenkaku", "Hankaku",
+            "Zenkaku Hankaku", "Touroku", "Massyo", "Kana Lock", "Kana Shift",
+            "Eisu Shift", "Eisu toggle", "Hangul", "Hangul Start",
+            "Hangul End", "Hangul Hanja", "Hangul Jamo", "Hangul Romaja",
+            "Hangul Jeonja", "Hangul Banja", "Hangul PreHanja",
+            "Hangul PostHanja", "Hangul Special", "Back", "Forward", "Stop",
+            "Refresh", "Volume Down", "Volume Mute", "Volume Up",
+            "Bass Boost", "Bass Up", "Bass Down", "Treble Up", "Treble Down",
+            "Media Play", "Media Stop", "Media Previous", "Media Next",
+            "Media Record", "Media Pause", "Toggle Media Play/Pause",
+            "Home Page", "Favorites", "Search", "Standby", "Open URL",
+            "Launch Mail", "Launch Media", "Launch (0)", "Launch (1)",
+            "Launch (2)", "Launch (3)", "Launch (4)", "Launch (5)",
+            "Launch (6)", "Launch (7)", "Launch (8)", "Launch (9)",
+            "Launch (A)", "Launch (B)", "Launch (C)", "Launch (D)",
+            "Launch (E)", "Launch (F)", "Monitor Brightness Up",
+            "Monitor Brightness Down", "Keyboard Light On/Off",
+            "Keyboard Brightness Up", "Keyboard Brightness Down", "Power Off",
+            "Wake Up", "Eject", "Screensaver", "WWW", "Memo", "LightBulb",
+            "Shop", "History", "Add Favorite", "Hot Links",
+            "Adjust Brightness", "Finance", "Community", "Media Rewind",
+            "Back Forward", "Application Left", "Application Right", "Book",
+            "CD", "Calculator", "To-do list", "Clear Grab", "Close", "Copy",
+            "Cut", "Display", "DOS", "Documents", "Spreadsheet", "Browser",
+            "Game", "Go", "iTouch", "Logoff", "Market", "Meeting",
+            "Keyboard Menu", "Menu PB", "My Sites", "News", "Home Office",
+            "Option", "Paste", "Phone", "Calendar", "Reply", "Reload",
+            "Rotate Windows", "Rotation PB", "Rotation KB", "Save", "Send",
+            "Spellchecker", "Split Screen", "Support", "Task Panel",
+            "Terminal", "Tools", "Travel", "Video", "Word Processor", "XFer",
+            "Zoom In", "Zoom Out", "Away", "Messenger", "WebCam",
+            "Mail Forward", "Pictures", "Music", "Battery", "Bluetooth",
+            "Wireless", "Ultra Wide Band", "Media Fast Forward",
+            "Audio Repeat", "Audio Random Play", "Subtitle",
+            "Audio Cycle Track", "Time", "Hibernate", "View", "Top Menu",
+            "Power Down", "Suspend", "Adjust contrast", "Launch (G)",
+            "Launch (H)", "Touchpad Toggle", "Touchpad On", "Touchpad Off",
+            "Microphone Mute", "Red", "Green", "Yellow", "Blue", "Channel Up",
+            "Channel Down", "Guide", "Info", "Settings",
+            "Microphone Volume Up", "Microphone Volume Down", "New", "Open",
+            "Find", "Undo", "Redo", "Select", "Yes", "No", "Cancel",
+            "Printer", "Execute", "Sleep", "Play", "Zoom", "Exit", "Context1",
+            "Context2", "Context3", "Context4", "Call", "Hangup", "Flip",
+            "Toggle Call/Hangup", "Voice Dial", "Last Number Redial",
+            "Camera Shutter", "Camera Focus"]
+# Alternative names accepted on input
+aliases = {"print screen": "Print",
+           "page up": "PgUp",
+           "page down": "PgDown",
+           "caps lock": "CapsLock",
+           "num lock": "NumLock",
+           "number lock": "NumLock",
+           "scroll lock": "ScrollLock",
+           "insert": "Ins",
+           "delete": "Del",
+           "escape": "Esc",
+           "system request": "SysReq"}
+# Lowercase name -> canonical name
+names = dict([(n.lower(), n) for n in keyNames])
+names.update(aliases)
+modifiers = {"meta+": "Meta",
+             "ctrl+": "Ctrl",
+             "alt+": "Alt",
+             "shift+": "Shift",
+             "num+": "Num"}
+order = ["Meta", "Ctrl", "Alt", "Shift", "Num"]
+function = re.compile(r"^f(\d+)$")
+maxChords = 4
+cache = {}
+cacheLimit = 65536
+
+
+def upper(c):
+    """Uppercase a character, keep it if it has no single uppercase."""
+    u = c.upper()
+    if len(u) == 1:
+        return u
+    return c
+
+
+def keyName(key):
+    """Canonical name of the key part or None."""
+    if len(key) == 1:
+        if key == " ":
+            return "Space"
+        if key == "\x00":
+            # Key code 0, only the modifiers are shown
+            return ""
+        # Qt counts UTF-16 units, surrogates are not single keys
+        if ord(key) > 0xFFFF or 0xD800 <= ord(key) <= 0xDFFF:
+            return None
+        return upper(key)
+    m = function.match(key)
+    if m and 1 <= int(m.group(1)) <= 35:
+        return "F" + str(int(m.group(1)))
+    return names.get(key)
+
+
+def decode(chord):
+    """Canonical text of a single chord, empty if it is not valid."""
+    # Like QString::toLower, "\u0130" becomes two characters and unknown
+    accel = chord.lower()
+    found = set()
+    last = 0
+    i = accel.find("+", 1)
+    while i != -1:
+        sub = accel[last:i + 1]
+        if len(sub) == 1:
+            # Only a single "+" at the end is a key
+            if accel.rfind("+") != len(accel) - 1:
+                return ""
+        elif sub in modifiers:
+            found.add(modifiers[sub])
+        else:
+            return ""
+        last = i + 1
+        i = accel.find("+", i + 1)
+    key = accel
+    p = accel.rfind("+", 0, len(accel) - 1)
+    if p > 0:
+        key = accel[p + 1:]
+    name = keyName(key)
+    if name is None:
+        return ""
+    return "+".join([m for m in order if m in found] + [name])
+
+
+def split(text):
+    """Split text into chords the way QKeySequence does."""
+    chords = []
+    rest = text
+    while rest and len(chords) < maxChords:
+        p = rest.find(",")
+        diff = 0
+        if p == len(rest) - 1:
+            # Last comma is the key, "Ctrl+,"
+            p = -1
+        elif p != -1:
+            if rest[p + 1] == ",":
+                p += 1
+            if p + 1 < len(rest) and rest[p + 1] == " ":
+                diff = 1
+                p += 1
+        if p == -1:
+            chords.append(rest)
+            rest = ""
+        else:
+            chords.append(rest[:p - diff])
+            rest = rest[p + 1:]
+    return chords
+
+
+def normalize(text):
+    """Return text as QKeySequence(text).toString() does."""
+    try:
+        return cache[text]
+    except KeyError:
+        pass
+    if len(cache) >= cacheLimit:
+        cache.clear()
+    result = ", ".join([decode(c) for c in split(text)])
+    cache[text] = result
+    return result
+
+
+def validate(shortcuts):
+    """Normalize {command: shortcut}, return (valid, invalid commands).
+
+    A shortcut is invalid if normalizing leaves an empty chord.
+    """
+    valid = {}
+    invalid = []
+    for command in shortcuts:
+        text = normalize(shortcuts[command])
+        if text and "" not in text.split(", "):
+            valid[command] = text
+        else:
+            invalid.append(command)
+    return valid, invalid
@@ -0,0 +1,277 @@
+# ShortCuts overlay for FreeCAD
+# Copyright (C) 2016, 2017, 2018 triplus @ FreeCAD
+#
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+
+"""Overlay sequence matching for ShortCuts."""
+
+
+import re
+import bisect
+import unicodedata
+
+
+def buildTrie(sequences):
+    """Compile sequences into a prefix trie.
+
+    Node is a list of [children, sequence, count], where sequence is set on
+    nodes that complete a sequence and count is the number of sequences that
+    pass through the node.
+    """
+    root = [{}, None, 0]
+    for seq in sequences:
+        if not seq:
+            continue
+        node = root
+        node[2] += 1
+        for ch in seq:
+            node = node[0].setdefault(ch, [{}, None, 0])
+            node[2] += 1
+        node[1] = seq
+    return root
+
+
+def lookup(trie, text):
+    """Return (sequence, wait) for the typed text.
+
+    Sequence is the full sequence uniquely identified by text or None. Wait
+    is True if text is a complete sequence and also a prefix of a longer one,
+    the caller should then run the sequence only after a delay.
+    """
+    node = trie
+    for ch in text:
+        node = node[0].get(ch)
+        if node is None:
+            return None, False
+    if node[1] is not None:
+        return node[1], bool(node[0])
+    if node[2] != 1:
+        return None, False
+    while node[1] is None:
+        for ch in node[0]:
+            node = node[0][ch]
+    return node[1], False
+
+
+def fold(text):
+    """Lowercase text and drop characters that break matching."""
+    return (text
+            .replace("&", "")
+            .replace("\n", " ")
+            .replace("\t", " ")
+            .lower())
+
+
+def unaccent(text):
+    """Drop accents, Py2 byte strings are returned unchanged."""
+    try:
+        text = unicodedata.normalize("NFKD", text)
+        return "".join([c for c in text if not unicodedata.combining(c)])
+    except TypeError:
+        return text
+
+
+def initials(text):
+    """First letters of words."""
+    return "".join([w[0] for w in text.split() if w])
+
+
+def buildIndex(entries):
+    """Precompute search data for {key: (shortcut, text, tooltip)}.
+
+    Fields are folded once. Sorted shortcut, text, word and initials lists
+    answer prefix tiers with bisect, per entry haystacks answer
+    subsequence queries with compiled patterns.
+    """
+    index = {"keys": [],
+             "shortcut": [],
+             "text": [],
+             "tooltip": [],
+             "hay": [],
+             "sortedShortcut": [],
+             "sortedText": [],
+             "sortedWords": [],
+             "sortedInitials": [],
+             "last": None}
+    for n, key in enumerate(entries):
+        shortcut, text, tooltip = entries[key]
+        shortcut = fold(shortcut)
+        text = fold(text)
+        tooltip = fold(tooltip)
+        hay = shortcut + "\t" + text + "\t" + tooltip
+        index["keys"].append(key)
+        index["shortcut"].append(shortcut)
+        index["text"].append(text)
+        index["tooltip"].append(tooltip)
+        index["hay"].append(hay)
+        index["sortedShortcut"].append((shortcut, n))
+        index["sortedText"].append((text, n))
+        index["sortedInitials"].append((initials(text), n))
+        for p in range(1, len(text)):
+            if text[p - 1] == " " and text[p] != " ":
+                index["sortedWords"].append((text[p:], n))
+    for name in ("sortedShortcut",
+                 "sortedText",
+                 "sortedWords",
+                 "sortedInitials"):
+        index[name].sort()
+    return index
+
+
+def subsequence(query, anchored=False):
+    """Compiled pattern matching query characters in order.
+
+    Gaps use negated character classes, so a failed match does not
+    backtrack into earlier gaps. Anchored patterns are meant for match(),
+    they only test if the query is a subsequence and never retry from
+    later positions.
+    """
+    pattern = ""
+    if anchored:
+        pattern = "[^" + re.escape(query[0]) + "]*"
+    pattern += re.escape(query[0])
+    for c in query[1:]:
+        pattern += "[^" + re.escape(c) + "]*" + re.escape(c)
+    return re.compile(pattern)
+
+
+def prefixed(sortedList, query, seen):
+    """Entries from the sorted list starting with query, in sorted order."""
+    hits = []
+    i = bisect.bisect_left(sortedList, (query,))
+    while i < len(sortedList) and sortedList[i][0].startswith(query):
+        n = sortedList[i][1]
+        if n not in seen:
+            seen.add(n)
+            hits.append(n)
+        i += 1
+    return hits
+
+
+def candidates(index, query, pattern):
+    """Numbers of entries with the query as a subsequence."""
+    match = subsequence(query, anchored=True).match
+    hay = index["hay"]
+    last = index["last"]
+    if last and query.startswith(last[0]):
+        return [n for n in last[1] if match(hay[n])]
+    return [n for n in range(len(hay)) if match(hay[n])]
+
+
+def search(index, query, limit=None):
+    """Return keys of matching entries, best match first.
+
+    Matches are ranked in tiers: shortcut, text start, word start,
+    initials, substring, subsequence and tooltip. Tiers are evaluated in
+    order and evaluation stops once the limit is reached. If query extends
+    the previous query only previous matches are considered.
+    """
+    keys = index["keys"]
+    query = fold(query)
+    if not query:
+        return keys[:limit]
+    pattern = subsequence(query)
+    seen = set()
+    result = []
+    shortcut = index["shortcut"]
+    text = index["text"]
+    tooltip = index["tooltip"]
+
+    def full():
+        """Limit reached."""
+        return limit and len(result) >= limit
+
+    # Prefix tiers, a prefix always is a subsequence of the haystack
+    for name in ("sortedShortcut",
+                 "sortedText",
+                 "sortedWords",
+                 "sortedInitials"):
+        result.extend(prefixed(index[name], query, seen))
+        if full():
+            index["last"] = None
+            return [keys[n] for n in result[:limit]]
+
+    # Linear tiers over the remaining matches
+    found = candidates(index, query, pattern)
+    index["last"] = (query, found)
+    remaining = [n for n in found if n not in seen]
+    linear = [
+        (lambda n: query in shortcut[n],
+         lambda n: (shortcut[n].find(query), text[n])),
+        (lambda n: query in text[n],
+         lambda n: (text[n].find(query), len(text[n]), text[n])),
+        (lambda n: pattern.search(shortcut[n]),
+         lambda n: (len(shortcut[n]), text[n])),
+        (lambda n: pattern.search(text[n]),
+         lambda n: (span(pattern.search(text[n])), len(text[n]), text[n])),
+        (lambda n: query in tooltip[n],
+         lambda n: (tooltip[n].find(query), text[n])),
+        (lambda n: True,
+         lambda n: (len(text[n]), text[n])),
+    ]
+    for test, key in linear:
+        if not remaining:
+            break
+        hits = []
+        rest = []
+        for n in remaining:
+            if test(n):
+                hits.append(n)
+            else:
+                rest.append(n)
+        hits.sort(key=key)
+        result.extend(hits)
+        if full():
+            break
+        remaining = rest
+    return [keys[n] for n in result[:limit]]
+
+
+def span(match):
+    """Length of the matched text."""
+    return match.end() - match.start()
+
+
+def buildFilter(entries):
+    """Folded haystacks for {key: (field, ...)} substring filtering."""
+    index = {"keys": [], "hay": [], "last": None}
+    for key in entries:
+        index["keys"].append(key)
+        index["hay"].append(unaccent(fold("\t".join(entries[key]))))
+    return index
+
+
+def filterKeys(index, query):
+    """Return set of keys with all query words in any field or None.
+
+    None means no filter (empty query). If query extends the previous query
+    only previous matches are tested.
+    """
+    query = unaccent(fold(query))
+    words = query.split()
+    if not words:
+        index["last"] = None
+        return None
+    hay = index["hay"]
+    last = index["last"]
+    if last and query.startswith(last[0]):
+        numbers = last[1]
+    else:
+        numbers = range(len(hay))
+    found = [n for n in numbers if all([w in hay[n] for w in words])]
+    index["last"] = (query, found)
+    keys = index["keys"]
+    return set([keys[n] for n in found])
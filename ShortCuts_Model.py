@@ -0,0 +1,207 @@
+# ShortCuts overlay for FreeCAD
+# Copyright (C) 2016, 2017, 2018 triplus @ FreeCAD
+#
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+
+"""Table model of commands and shortcuts for ShortCuts.
+
+Cell data is produced lazily in data(), only for rows the view displays.
+Single edits emit dataChanged for one row instead of rebuilding the table.
+Search filters rows in a single model reset using a folded text index.
+"""
+
+
+from PySide import QtGui
+from PySide import QtCore
+import ShortCuts_Registry
+import ShortCuts_Match
+
+
+class TableModel(QtCore.QAbstractTableModel):
+    """Commands and shortcuts.
+
+    Shortcut column data comes from the callbacks:
+    shortcut(command) -> text, icon(command) -> QIcon or None,
+    tooltip(command) -> text, edit(command, text) and optional
+    conflict(command) -> True if the shortcut is shared with others.
+    """
+
+    def __init__(self, shortcut, icon, tooltip, edit, fallback,
+                 conflict=None, parent=None):
+        super(TableModel, self).__init__(parent)
+        # All commands and the visible (filtered) ones
+        self.all = []
+        self.commands = []
+        self.rows = {}
+        self.search = ""
+        self.searchData = None
+        self.shortcut = shortcut
+        self.icon = icon
+        self.tooltip = tooltip
+        self.edit = edit
+        self.fallback = fallback
+        self.conflict = conflict
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """Number of commands."""
+        if parent.isValid():
+            return 0
+        return len(self.commands)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """Command and shortcut."""
+        if parent.isValid():
+            return 0
+        return 2
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        """Column titles."""
+        if (orientation == QtCore.Qt.Horizontal and
+                role == QtCore.Qt.DisplayRole):
+            return ["Command", "Shortcut"][section]
+        return None
+
+    def flags(self, index):
+        """Only shortcuts are editable."""
+        if index.column() == 1:
+            return (QtCore.Qt.ItemIsEnabled |
+                    QtCore.Qt.ItemIsSelectable |
+                    QtCore.Qt.ItemIsEditable)
+        return QtCore.Qt.ItemIsEnabled
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """Cell data, produced on demand."""
+        if not index.isValid() or index.row() >= len(self.commands):
+            return None
+        command = self.commands[index.row()]
+        if role == QtCore.Qt.UserRole:
+            return command
+        action = ShortCuts_Registry.actions.get(command)
+        if action is None:
+            return None
+        if index.column() == 0:
+            if role == QtCore.Qt.DisplayRole:
+                return action.text().replace("&", "")
+            if role == QtCore.Qt.ToolTipRole:
+                return action.toolTip()
+            if role == QtCore.Qt.DecorationRole:
+                if action.icon():
+                    return action.icon()
+                return self.fallback
+        else:
+            if role == QtCore.Qt.DisplayRole or role == QtCore.Qt.EditRole:
+                return self.shortcut(command)
+            if role == QtCore.Qt.ToolTipRole:
+                return self.tooltip(command)
+            if role == QtCore.Qt.DecorationRole:
+                return self.icon(command)
+            if (role == QtCore.Qt.ForegroundRole and
+                    self.conflict and
+                    self.conflict(command)):
+                return QtGui.QBrush(QtCore.Qt.red)
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """Pass the edited shortcut to the edit callback."""
+        if role != QtCore.Qt.EditRole or index.column() != 1:
+            return False
+        command = self.commands[index.row()]
+        # Delegates commit on Enter or focus out even if nothing was typed
+        if (value or "") == (self.shortcut(command) or ""):
+            return False
+        self.edit(command, value or "")
+        # Shortcut is part of the search index
+        self.searchData = None
+        self.refresh(command)
+        return True
+
+    def command(self, row):
+        """Command name of the row."""
+        return self.commands[row]
+
+    def setCommands(self, commands):
+        """Set commands, the model is reset only if they changed."""
+        self.searchData = None
+        if commands == self.all:
+            if self.search:
+                self.setSearch(self.search)
+            else:
+                self.refreshAll()
+            return
+        self.all = list(commands)
+        self.setSearch(self.search)
+
+    def searchIndex(self):
+        """Folded text, name, tooltip and shortcut of all commands."""
+        if self.searchData is None:
+            entries = {}
+            for command in self.all:
+                action = ShortCuts_Registry.actions.get(command)
+                if action is None:
+                    continue
+                entries[command] = (action.text(),
+                                    command,
+                                    action.toolTip(),
+                                    self.shortcut(command) or "")
+            self.searchData = ShortCuts_Match.buildFilter(entries)
+        return self.searchData
+
+    def setSearch(self, text):
+        """Show only commands matching the search text."""
+        self.search = text
+        keys = None
+        if text:
+            keys = ShortCuts_Match.filterKeys(self.searchIndex(), text)
+        if keys is None:
+            visible = self.all
+        else:
+            visible = [c for c in self.all if c in keys]
+        self.beginResetModel()
+        self.commands = list(visible)
+        self.rows = {}
+        for row, command in enumerate(self.commands):
+            self.rows[command] = row
+        self.endResetModel()
+
+    def refresh(self, command):
+        """Emit dataChanged for the command row."""
+        row = self.rows.get(command)
+        if row is not None:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, 1))
+
+    def refreshAll(self):
+        """Emit dataChanged for all rows, views fetch visible rows only."""
+        if self.commands:
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(len(self.commands) - 1, 1))
+
+
+def tableView(model):
+    """Table view for the model."""
+    table = QtGui.QTableView()
+    table.setModel(model)
+    table.verticalHeader().setVisible(False)
+    # Uniform row height lets the view skip measuring rows
+    table.verticalHeader().setDefaultSectionSize(
+        table.fontMetrics().height() + 8)
+    # Qt4/Qt5
+    try:
+        table.horizontalHeader().setResizeMode(QtGui.QHeaderView.Stretch)
+    except AttributeError:
+        table.horizontalHeader().setSectionResizeMode(QtGui.
+                                                      QHeaderView.
+                                                      Stretch)
+    return table
@@ -0,0 +1,396 @@
+# ShortCuts overlay for FreeCAD
+# Copyright (C) 2016, 2017, 2018 triplus @ FreeCAD
+#
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+
+"""Action registry for ShortCuts.
+
+The registry scans the main window for actions only once. Afterwards it is
+kept current from child added, child removed, destroyed, object name changed
+and action changed events. Containers (the main window and every object below
+it that is not an action) are watched with an event filter and marked dirty
+on change, the registry is then brought up to date on the next lookup. Sorted
+orders of actions and commands are maintained on change, sort keys are
+computed once per registered action and again when its text changes.
+"""
+
+
+import bisect
+from PySide import QtGui
+from PySide import QtCore
+import FreeCADGui as Gui
+try:
+    from shiboken6 import isValid
+except ImportError:
+    try:
+        from shiboken2 import isValid
+    except ImportError:
+        try:
+            from shiboken import isValid
+        except ImportError:
+            isValid = None
+
+
+# Unique actions with text (overlay rules)
+actions = {}
+# Unique actions with text and without a comma in name (manager rules)
+commands = {}
+# Object name -> set of tracked action keys
+names = {}
+# Action key -> [action, registered name or None, connected slot]
+tracked = {}
+# Container key -> [container, {child key: child}]
+containers = {}
+# Name -> (text, name) sort key of the registered action
+sortKeys = {}
+# Sorted (text, name) keys of actions and commands
+actionOrder = []
+commandOrder = []
+dirty = set()
+listeners = []
+# Sweep is set when a container was destroyed
+state = {"started": False, "generation": 0, "bulk": False, "sweep": False}
+mw = Gui.getMainWindow()
+
+
+class Watcher(QtCore.QObject):
+    """Mark containers dirty on child added or removed."""
+
+    def __init__(self, parent=None):
+        super(Watcher, self).__init__(parent)
+
+    def eventFilter(self, obj, e):
+        """Only remember the container, children are inspected later."""
+        if (e.type() == QtCore.QEvent.ChildAdded or
+                e.type() == QtCore.QEvent.ChildRemoved):
+            dirty.add(id(obj))
+        return False
+
+    def onDestroyed(self, obj=None):
+        """Destroyed containers are dropped on next lookup."""
+        state["sweep"] = True
+
+
+def onChanged(key):
+    """Re-register and re-sort the action after a name or text change."""
+    if key in tracked:
+        changed = set()
+        register(key, changed)
+        action, name = tracked[key][:2]
+        if (name and name not in changed and
+                actions.get(name) is action and
+                sortKeys.get(name) != sortKey(name, action)):
+            unsort(name)
+            insort(name, action)
+            changed.add(name)
+        notify(changed)
+
+
+watcher = Watcher(mw)
+
+
+def alive(obj):
+    """False if the C++ object was deleted."""
+    if isValid is not None:
+        return isValid(obj)
+    try:
+        obj.objectName()
+    except RuntimeError:
+        return False
+    return True
+
+
+def actionName(action):
+    """Name the action is registered under or None."""
+    try:
+        name = action.objectName()
+        if name and action.text():
+            return name
+    except RuntimeError:
+        pass
+    return None
+
+
+def sortKey(name, action):
+    """Sort key, text without mnemonic then name."""
+    try:
+        text = action.text().replace("&", "")
+    except RuntimeError:
+        text = ""
+    return (text, name)
+
+
+def insort(name, action):
+    """Insert the name into the sorted orders."""
+    key = sortKey(name, action)
+    sortKeys[name] = key
+    if state["bulk"]:
+        return
+    bisect.insort(actionOrder, key)
+    if "," not in name:
+        bisect.insort(commandOrder, key)
+
+
+def unsort(name):
+    """Remove the name from the sorted orders."""
+    key = sortKeys.pop(name, None)
+    if key is None or state["bulk"]:
+        return
+    for order in (actionOrder, commandOrder):
+        i = bisect.bisect_left(order, key)
+        if i < len(order) and order[i] == key:
+            del order[i]
+
+
+def resort():
+    """Rebuild the sorted orders from sort keys."""
+    actionOrder[:] = sorted(sortKeys.values())
+    commandOrder[:] = [k for k in actionOrder if "," not in k[1]]
+
+
+def reindex(name):
+    """Apply the drop duplicate objectName rules for a single name."""
+    keys = names.get(name)
+    if keys and len(keys) == 1:
+        for k in keys:
+            action = tracked[k][0]
+        if actions.get(name) is not action:
+            unsort(name)
+            insort(name, action)
+        actions[name] = action
+        if "," not in name:
+            commands[name] = action
+    else:
+        if name in actions:
+            unsort(name)
+        actions.pop(name, None)
+        commands.pop(name, None)
+        if not keys:
+            names.pop(name, None)
+
+
+def register(key, changed):
+    """Register tracked action under its current name."""
+    action, old = tracked[key][:2]
+    new = actionName(action)
+    if new == old:
+        return
+    if old:
+        names[old].discard(key)
+        reindex(old)
+        changed.add(old)
+    tracked[key][1] = new
+    if new:
+        names.setdefault(new, set()).add(key)
+        reindex(new)
+        changed.add(new)
+
+
+def track(action, changed):
+    """Start tracking the action."""
+    key = id(action)
+    if key in tracked:
+        return
+    def slot(*args):
+        """Name or text of the action changed."""
+        onChanged(key)
+
+    tracked[key] = [action, None, slot]
+    action.changed.connect(slot)
+    try:
+        action.objectNameChanged.connect(slot)
+    except AttributeError:
+        # Qt4
+        pass
+    register(key, changed)
+
+
+def untrack(key, changed):
+    """Stop tracking the action."""
+    action, name, slot = tracked.pop(key)
+    if alive(action):
+        try:
+            action.changed.disconnect(slot)
+            action.objectNameChanged.disconnect(slot)
+        except (AttributeError, RuntimeError, TypeError):
+            pass
+    if name:
+        names[name].discard(key)
+        reindex(name)
+        changed.add(name)
+
+
+def watch(obj):
+    """Watch the container for added and removed children."""
+    key = id(obj)
+    if key not in containers:
+        obj.installEventFilter(watcher)
+        obj.destroyed.connect(watcher.onDestroyed)
+        containers[key] = [obj, {}]
+        dirty.add(key)
+
+
+def unwatch(key, changed):
+    """Forget the container and the actions and containers below it."""
+    obj, kids = containers.pop(key)
+    dirty.discard(key)
+    for k in kids:
+        if k in tracked:
+            untrack(k, changed)
+        elif k in containers:
+            unwatch(k, changed)
+    if alive(obj):
+        obj.removeEventFilter(watcher)
+        obj.destroyed.disconnect(watcher.onDestroyed)
+
+
+def scan(key, changed):
+    """Compare container children with the previous snapshot."""
+    obj, kids = containers[key]
+    if not alive(obj):
+        unwatch(key, changed)
+        return
+    children = obj.children()
+    found = {}
+    for c in children:
+        k = id(c)
+        found[k] = c
+        if k in kids:
+            continue
+        if isinstance(c, QtGui.QAction):
+            track(c, changed)
+        elif c is not watcher:
+            # Actions may be added to it later
+            watch(c)
+    for k in kids:
+        if k in found:
+            continue
+        if k in tracked:
+            child = tracked[k][0]
+        elif k in containers:
+            child = containers[k][0]
+        else:
+            continue
+        parent = child.parent() if alive(child) else None
+        # Kept if it moved to another watched container
+        if (parent is None or
+                id(parent) == key or
+                id(parent) not in containers):
+            if k in tracked:
+                untrack(k, changed)
+            else:
+                unwatch(k, changed)
+    containers[key][1] = found
+
+
+def notify(changed):
+    """Inform listeners about changed names."""
+    if changed:
+        state["generation"] += 1
+        for fn in listeners:
+            fn(changed)
+
+
+def process(changed):
+    """Scan dirty containers until none are left."""
+    if state["sweep"]:
+        # Children of a destroyed container get no child removed events
+        state["sweep"] = False
+        for key in containers:
+            if not alive(containers[key][0]):
+                dirty.add(key)
+    while dirty:
+        key = dirty.pop()
+        if key in containers:
+            scan(key, changed)
+
+
+def flush():
+    """Process dirty containers."""
+    if dirty or state["sweep"]:
+        changed = set()
+        process(changed)
+        notify(changed)
+
+
+def rescan():
+    """Full scan fallback, rebuild the registry from scratch."""
+    changed = set(names)
+    # Sort once instead of inserting each action
+    state["bulk"] = True
+    try:
+        for k in list(containers):
+            if k in containers:
+                unwatch(k, changed)
+        for k in list(tracked):
+            untrack(k, changed)
+        watch(mw)
+        state["started"] = True
+        process(changed)
+    finally:
+        state["bulk"] = False
+        resort()
+    notify(changed)
+
+
+def update():
+    """Bring the registry up to date, scan on first use."""
+    if state["started"]:
+        flush()
+    else:
+        rescan()
+
+
+def getActions():
+    """Unique actions with text."""
+    update()
+    return actions
+
+
+def getCommands():
+    """Unique actions with text and without a comma in name."""
+    update()
+    return commands
+
+
+def sortedActions():
+    """Names of actions sorted by text."""
+    update()
+    return [k[1] for k in actionOrder]
+
+
+def sortedCommands():
+    """Names of commands sorted by text."""
+    update()
+    return [k[1] for k in commandOrder]
+
+
+def lookup(name):
+    """Return action for the command name or None."""
+    update()
+    return actions.get(name)
+
+
+def allActions():
+    """All tracked actions, including duplicates."""
+    update()
+    return [tracked[k][0] for k in tracked]
+
+
+def connect(fn):
+    """Call fn with a set of changed names after each update."""
+    if fn not in listeners:
+        listeners.append(fn)
@@ -0,0 +1,260 @@
+# ShortCuts overlay for FreeCAD
+# Copyright (C) 2016, 2017, 2018 triplus @ FreeCAD
+#
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+
+"""Headless benchmarks for ShortCuts.
+
+Runs outside FreeCAD with the stand-in modules from the stubs directory
+and offscreen Qt (PySide6 or PySide2 is required).
+
+    python benchmarks/bench.py
+    python benchmarks/bench.py --sizes 1000,10000 --repeat 10 -o out.json
+
+Every size runs in its own process. Results are printed as JSON, timings
+are in milliseconds: {"sizes": {"1000": {"update": {"min": ...}}}}.
+"""
+
+
+import os
+import sys
+import json
+import time
+import runpy
+import argparse
+import platform
+import subprocess
+
+
+here = os.path.dirname(os.path.abspath(__file__))
+repo = os.path.dirname(here)
+stubs = os.path.join(here, "stubs")
+
+workbenchCount = 20
+# Database bindings per workbench and global, as a fraction of actions
+localShare = 50
+globalShare = 20
+# Commands written per database run
+edits = 100
+
+
+def setup(size):
+    """Create workbenches, actions and databases for size actions."""
+    sys.path.insert(0, repo)
+    sys.path.insert(0, stubs)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PySide import QtGui
+    import FreeCAD as App
+    import FreeCADGui as Gui
+
+    names = []
+    for w in range(workbenchCount):
+        names.append(Gui.addWorkbench("Bench%02dWorkbench" % w,
+                                      "Bench %02d" % w))
+
+    mw = Gui.getMainWindow()
+    menus = [QtGui.QMenu(mw) for w in range(workbenchCount)]
+    commands = []
+    for n in range(size):
+        action = QtGui.QAction(menus[n % workbenchCount])
+        action.setObjectName("Bench_Cmd%05d" % n)
+        action.setText("&Command %d" % n)
+        action.setToolTip("Benchmark command number %d" % n)
+        if n % 7 == 0:
+            action.setShortcut(QtGui.QKeySequence("Ctrl+Alt+F%d" %
+                                                  (n % 12 + 1)))
+        commands.append(action.objectName())
+
+    # Shortcuts manager database
+    dev = App.ParamGet("User parameter:BaseApp/ShortCutsDev").GetGroup("User")
+    wbs = [wb.__class__.__name__ for wb in names] + ["GlobalShortcuts"]
+    for w, wb in enumerate(wbs):
+        share = globalShare if wb == "GlobalShortcuts" else localShare
+        g = dev.GetGroup(wb)
+        index = []
+        for i in range(max(1, size // share)):
+            n = str(i + 1)
+            index.append(n)
+            sub = g.GetGroup(n)
+            sub.SetString("command", commands[(i * 7 + w) % size])
+            sub.SetString("shortcut", "Ctrl+Shift+%d, %d" % (i % 10, w % 10))
+        g.SetString("index", ",".join(index))
+
+    # Overlay database
+    user = App.ParamGet("User parameter:BaseApp/ShortCuts/User")
+    for w, text in enumerate([wb.MenuText for wb in names] +
+                             ["Global shortcuts"]):
+        share = globalShare if text == "Global shortcuts" else localShare
+        g = user.GetGroup(text)
+        index = []
+        for i in range(max(1, size // share)):
+            n = str(i + 1)
+            index.append(n)
+            sub = g.GetGroup(n)
+            sub.SetString("command", commands[(i * 11 + w) % size])
+            sub.SetString("shortcut", "%s%d" % (chr(65 + w % 26), i))
+        g.SetString("IndexList", ",".join(index))
+
+    Gui.activateWorkbench(names[0].__class__.__name__)
+    return [wb.__class__.__name__ for wb in names], menus
+
+
+def measure(fn, repeat, prepare=None):
+    """Return run times of fn in milliseconds, prepare is not timed."""
+    times = []
+    for r in range(repeat):
+        if prepare:
+            prepare(r)
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000.0)
+    return times
+
+
+def summary(times):
+    """Min, median, mean and max of run times."""
+    ordered = sorted(times)
+    return {"min": ordered[0],
+            "median": ordered[len(ordered) // 2],
+            "mean": sum(ordered) / len(ordered),
+            "max": ordered[-1],
+            "runs": len(ordered)}
+
+
+def worker(size, repeat):
+    """Run all benchmarks for one size and return the results."""
+    wbs, menus = setup(size)
+
+    from PySide import QtGui
+    import FreeCADGui as Gui
+
+    results = {}
+
+    start = time.perf_counter()
+    import ShortCuts_Gui
+    import ShortCuts_Registry
+    import ShortCuts_Database
+    results["importGui"] = summary([(time.perf_counter() - start) * 1000.0])
+
+    results["rescan"] = summary(measure(ShortCuts_Registry.rescan, 1))
+
+    def churn(r):
+        """Add an action so the registry has work to do."""
+        action = QtGui.QAction(menus[r % len(menus)])
+        action.setObjectName("Bench_Churn%d" % r)
+        action.setText("Churn %d" % r)
+
+    results["updateActions"] = summary(measure(ShortCuts_Gui.updateActions,
+                                               repeat,
+                                               churn))
+
+    def switch(r):
+        """Alternate between two workbenches."""
+        state["wb"] = wbs[r % 2]
+
+    state = {"wb": wbs[0]}
+    results["update"] = summary(measure(lambda: ShortCuts_Gui
+                                        .update(state["wb"]),
+                                        repeat,
+                                        switch))
+
+    commands = ShortCuts_Registry.sortedCommands()[:edits]
+
+    def shift(r):
+        """Use shortcuts that differ from the previous run."""
+        state["run"] = r
+
+    def edit():
+        """Change shortcuts of commands, every run writes all of them."""
+        ShortCuts_Gui.database("User", wbs[2], dict(
+            [(c, "Ctrl+Alt+Shift+%d" % ((i + state["run"]) % 10))
+             for i, c in enumerate(commands)]))
+
+    state["run"] = 0
+    results["database"] = summary(measure(edit, repeat, shift))
+
+    def batch():
+        """Same writes inside a transaction."""
+        with ShortCuts_Database.transaction():
+            edit()
+
+    # Continue after the runs above so every commit has a net change
+    results["databaseTransaction"] = summary(measure(
+        batch, repeat, lambda r: shift(r + repeat)))
+
+    cBox = ShortCuts_Gui.comboBox()
+    table = ShortCuts_Gui.tableWidget(lambda command, shortcut: None)
+    table.resize(900, 500)
+    results["updateTable"] = summary(measure(lambda: ShortCuts_Gui
+                                             .updateTable(cBox, table),
+                                             repeat))
+
+    # Overlay, shortCuts() returns the build function
+    namespace = runpy.run_path(os.path.join(repo, "InitGui.py"))
+    start = time.perf_counter()
+    overlay = namespace["shortCuts"]()()
+    results["buildOverlay"] = summary([(time.perf_counter() - start) *
+                                       1000.0])
+
+    def activate(r):
+        """Switch workbench so the completer model is patched."""
+        Gui.activateWorkbench(wbs[r % 2])
+        overlay["apply"]()
+
+    results["modelData"] = summary(measure(overlay["modelData"],
+                                           repeat,
+                                           activate))
+    results["commandList"] = summary(measure(overlay["commandList"],
+                                             repeat))
+    return results
+
+
+def main():
+    """Run each size in a subprocess and print combined JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", default="1000,10000,50000",
+                        help="comma separated numbers of actions")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="runs per benchmark")
+    parser.add_argument("-o", "--output", help="write JSON to file")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        json.dump(worker(args.worker, args.repeat), sys.stdout)
+        return
+
+    report = {"python": platform.python_version(),
+              "platform": platform.platform(),
+              "repeat": args.repeat,
+              "sizes": {}}
+    for size in [int(s) for s in args.sizes.split(",") if s]:
+        out = subprocess.check_output([sys.executable,
+                                       os.path.abspath(__file__),
+                                       "--worker", str(size),
+                                       "--repeat", str(args.repeat)])
+        report["sizes"][str(size)] = json.loads(out.decode("UTF-8"))
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
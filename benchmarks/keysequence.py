@@ -0,0 +1,126 @@
+# ShortCuts overlay for FreeCAD
+# Copyright (C) 2016, 2017, 2018 triplus @ FreeCAD
+#
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+
+"""Compare ShortCuts_KeySequence with QKeySequence on a reference corpus.
+
+Runs outside FreeCAD with offscreen Qt (PySide6 or PySide2 is required).
+Re-run after a Qt upgrade:
+
+    python benchmarks/keysequence.py
+    python benchmarks/keysequence.py --count 200000 --seed 2
+
+The corpus holds random multi-chord sequences, every key name and every
+BMP character alone and with Ctrl. Mismatches are printed, the exit status
+is 1 if there are any. Strings starting with a byte order mark are left
+out, the binding strips it when converting to QString. Single letters can
+differ if Qt and Python use different Unicode versions for case mapping.
+"""
+
+
+import os
+import sys
+import random
+import argparse
+
+
+here = os.path.dirname(os.path.abspath(__file__))
+repo = os.path.dirname(here)
+stubs = os.path.join(here, "stubs")
+
+modifiers = ["ctrl", "Ctrl", "SHIFT", "shift", "alt", "Alt", "meta", "Meta",
+             "num", "Num", "control", "strg", ""]
+keys = ["a", "A", "z", "1", "0", "f1", "F12", "f35", "f36", "F0", "f01",
+        "esc", "Escape", "del", "Delete", "page up", "PgDown", "space", " ",
+        "+", ",", ";", u"ä", u"ß", u"İ", u"ı", "Ins",
+        "insert", "Return", "enter", "tab", "backtab", "home", "Media Play",
+        "volume up", "Launch (0)", "foo", "", "ctrl", "Shift", "Alt",
+        "print screen", "num lock", u"\U0001f600", "x y"]
+joins = ["+", "+", "+", " + ", "++"]
+separators = [", ", ",", ",,", ", , ", ",  "]
+
+
+def corpus(count, seed):
+    """Set of test strings, count random sequences plus fixed ones."""
+    import ShortCuts_KeySequence
+
+    rnd = random.Random(seed)
+    texts = set()
+    for n in range(count):
+        chords = []
+        for c in range(rnd.choice([1, 1, 1, 2, 2, 3, 5])):
+            mods = rnd.sample(modifiers, rnd.choice([0, 1, 1, 2, 3]))
+            chords.append(rnd.choice(joins).join(mods +
+                                                 [rnd.choice(keys)]))
+        text = chords[0]
+        for c in chords[1:]:
+            text += rnd.choice(separators) + c
+        texts.add(text)
+    for c in range(0x10000):
+        if 0xD800 <= c <= 0xDFFF or c in (0xFEFF, 0xFFFE):
+            continue
+        texts.add(chr(c))
+        texts.add("Ctrl+" + chr(c))
+    for name in ShortCuts_KeySequence.keyNames:
+        texts.add(name)
+        texts.add("shift+" + name.upper())
+    for name in ShortCuts_KeySequence.aliases:
+        texts.add(name)
+        texts.add("Alt+" + name)
+    return texts
+
+
+def compare(texts):
+    """Return [(text, Qt result, ShortCuts result)] for mismatches."""
+    from PySide import QtGui
+    import ShortCuts_KeySequence
+
+    mismatches = []
+    for text in sorted(texts):
+        expected = QtGui.QKeySequence(text).toString()
+        result = ShortCuts_KeySequence.normalize(text)
+        if expected != result:
+            mismatches.append((text, expected, result))
+    return mismatches
+
+
+def main():
+    """Compare and print mismatches."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--count", type=int, default=60000,
+                        help="number of random sequences")
+    parser.add_argument("--seed", type=int, default=1,
+                        help="random seed")
+    args = parser.parse_args()
+
+    sys.path.insert(0, repo)
+    sys.path.insert(0, stubs)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide import QtGui
+    app = QtGui.QApplication.instance() or QtGui.QApplication([])
+
+    texts = corpus(args.count, args.seed)
+    mismatches = compare(texts)
+    for text, expected, result in mismatches:
+        print("%r: Qt %r, ShortCuts %r" % (text, expected, result))
+    print("%d strings, %d mismatches" % (len(texts), len(mismatches)))
+    app.quit()
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
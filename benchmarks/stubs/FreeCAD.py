@@ -0,0 +1,149 @@
+# ShortCuts overlay for FreeCAD
+# Copyright (C) 2016, 2017, 2018 triplus @ FreeCAD
+#
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+
+"""Stand-in FreeCAD module for benchmarks.
+
+Parameters are kept in memory, the console discards messages unless the
+BENCH_VERBOSE environment variable is set.
+"""
+
+
+import os
+import sys
+import tempfile
+
+
+userDir = tempfile.mkdtemp(prefix="ShortCutsBench")
+
+
+class ParameterGrp(object):
+    """In-memory parameter group with observers."""
+
+    def __init__(self):
+        self.values = {}
+        self.groups = {}
+        self.observers = []
+
+    def notify(self, name):
+        """Inform observers about a changed parameter."""
+        for o in list(self.observers):
+            o.onChange(self, name)
+
+    def get(self, kind, name, default):
+        """Read typed value."""
+        return self.values.get((kind, name), default)
+
+    def set(self, kind, name, value):
+        """Write typed value and notify."""
+        self.values[(kind, name)] = value
+        self.notify(name)
+
+    def GetString(self, name, default=""):
+        return self.get("String", name, default)
+
+    def SetString(self, name, value):
+        if isinstance(value, bytes):
+            value = value.decode("UTF-8")
+        self.set("String", name, value)
+
+    def GetInt(self, name, default=0):
+        return self.get("Int", name, default)
+
+    def SetInt(self, name, value):
+        self.set("Int", name, int(value))
+
+    def GetBool(self, name, default=False):
+        return self.get("Bool", name, default)
+
+    def SetBool(self, name, value):
+        self.set("Bool", name, bool(value))
+
+    def HasGroup(self, name):
+        return name in self.groups
+
+    def GetGroup(self, name):
+        if name not in self.groups:
+            self.groups[name] = ParameterGrp()
+            self.notify(name)
+        return self.groups[name]
+
+    def GetGroups(self):
+        return list(self.groups)
+
+    def RemGroup(self, name):
+        if self.groups.pop(name, None) is not None:
+            self.notify(name)
+
+    def Attach(self, observer):
+        if observer not in self.observers:
+            self.observers.append(observer)
+
+    def Detach(self, observer):
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+
+root = ParameterGrp()
+
+
+def ParamGet(path):
+    """Return the parameter group for "User parameter:A/B/C"."""
+    g = root
+    for name in path.split(":", 1)[-1].split("/"):
+        if name:
+            g = g.GetGroup(name)
+    return g
+
+
+class ConsoleStub(object):
+    """Report view stand-in."""
+
+    def write(self, text):
+        """Print only in verbose mode."""
+        if os.environ.get("BENCH_VERBOSE"):
+            sys.stderr.write(text)
+
+    def PrintMessage(self, text):
+        self.write(text)
+
+    def PrintLog(self, text):
+        self.write(text)
+
+    def PrintWarning(self, text):
+        self.write(text)
+
+    def PrintError(self, text):
+        self.write(text)
+
+
+Console = ConsoleStub()
+
+
+def Version():
+    """Version list as returned by FreeCAD."""
+    return ["0", "19", "0", "Benchmark"]
+
+
+def getUserAppDataDir():
+    """Temporary user data directory."""
+    return userDir
+
+
+def getUserCachePath():
+    """Temporary user cache directory."""
+    return os.path.join(userDir, "cache")
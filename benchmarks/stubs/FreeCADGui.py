@@ -0,0 +1,85 @@
+# ShortCuts overlay for FreeCAD
+# Copyright (C) 2016, 2017, 2018 triplus @ FreeCAD
+#
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+
+"""Stand-in FreeCADGui module for benchmarks.
+
+A main window with the workbenchActivated signal and simulated workbenches.
+The QApplication is created on import.
+"""
+
+
+from PySide import QtGui
+from PySide import QtCore
+
+
+app = QtGui.QApplication.instance() or QtGui.QApplication([])
+
+
+class MainWindow(QtGui.QMainWindow):
+    """Main window stand-in."""
+
+    workbenchActivated = QtCore.Signal(str)
+
+    def __init__(self, parent=None):
+        super(MainWindow, self).__init__(parent)
+        self.setObjectName("MainWindow")
+        self.setCentralWidget(QtGui.QMdiArea(self))
+        self.setProperty("eventLoop", True)
+
+
+class Workbench(object):
+    """Workbench stand-in, class name identifies the workbench."""
+
+    MenuText = ""
+    Icon = ""
+
+
+mw = MainWindow()
+workbenches = {}
+state = {"active": None}
+
+
+def addWorkbench(name, menuText):
+    """Create a workbench with its own class named name."""
+    cls = type(name, (Workbench,), {"MenuText": menuText})
+    workbenches[name] = cls()
+    if state["active"] is None:
+        state["active"] = name
+    return workbenches[name]
+
+
+def getMainWindow():
+    return mw
+
+
+def listWorkbenches():
+    return dict(workbenches)
+
+
+def activeWorkbench():
+    return workbenches[state["active"]]
+
+
+def activateWorkbench(name):
+    if name in workbenches and name != state["active"]:
+        state["active"] = name
+        mw.workbenchActivated.emit(name)
+    return True
+
+
+addWorkbench("NoneWorkbench", "<none>")
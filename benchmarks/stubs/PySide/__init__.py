@@ -0,0 +1,46 @@
+# ShortCuts overlay for FreeCAD
+# Copyright (C) 2016, 2017, 2018 triplus @ FreeCAD
+#
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+
+"""PySide shim for benchmarks, as provided by FreeCAD.
+
+QtGui combines QtGui and QtWidgets of PySide6 or PySide2, so the Qt4 style
+imports used by ShortCuts keep working.
+"""
+
+
+import sys
+import types
+
+try:
+    from PySide6 import QtCore
+    from PySide6 import QtGui as Gui
+    from PySide6 import QtWidgets
+except ImportError:
+    from PySide2 import QtCore
+    from PySide2 import QtGui as Gui
+    from PySide2 import QtWidgets
+
+
+QtGui = types.ModuleType("PySide.QtGui")
+for m in (Gui, QtWidgets):
+    for name in dir(m):
+        if name.startswith("Q"):
+            setattr(QtGui, name, getattr(m, name))
+
+sys.modules["PySide.QtCore"] = QtCore
+sys.modules["PySide.QtGui"] = QtGui